@@ -0,0 +1,41 @@
+# check_linearize.py
+"""
+Verificação da saída linearizada (fast web view).
+
+Gera o formulário com ``create_pdf_form(linearize=True)`` e confere, pelos
+bytes do arquivo, o dicionário /Linearized: /L igual ao tamanho real e o
+fim da 1ª página (/E) antes do fim do arquivo.  Requer pikepdf.
+
+    python check_linearize.py
+"""
+
+import os
+import sys
+import tempfile
+
+import main
+from includes.linearize import is_linearized, linearization_info
+
+
+def check_linearized(filename):
+    """Falha (AssertionError) se ``filename`` não estiver linearizado."""
+    size = os.path.getsize(filename)
+    info = linearization_info(filename)
+    assert info, "dicionário /Linearized ausente no início do arquivo"
+    assert is_linearized(filename), f"is_linearized() falhou: {info}"
+    assert info["L"] == size, f"/L = {info['L']}, tamanho real = {size}"
+    assert info["E"] < info["L"], f"/E = {info['E']} não é menor que /L"
+    return info, size
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "linearizado.pdf")
+        main.create_pdf_form(filename, linearize=True)
+        try:
+            info, size = check_linearized(filename)
+        except AssertionError as exc:
+            print(f"FALHOU: {exc}")
+            sys.exit(1)
+    print(f"OK: /L = {info['L']} (= {size} bytes), /E = {info['E']}, "
+          f"/N = {info['N']}")
@@ -0,0 +1,115 @@
+# includes/aggregation.py
+"""
+Consolidação dos relatórios mensais de todas as oficinas.
+
+Os formulários devolvidos são lidos um a um (só os valores numéricos ficam
+em memória) e agrupados por ``oficina_servico`` + ``periodo_referencia``.
+Campos repetidos por índice (``membros_presentes_3_opt``,
+``atividade_7_pub_ext_opt``, ...) viram uma única métrica
+(``membros_presentes_opt``, ``atividade_pub_ext_opt``) e as somas por
+grupo são feitas com NumPy.
+"""
+
+from __future__ import annotations
+import re
+
+import numpy as np
+
+from includes.manifest import build_manifest, resolve_options
+from includes.validation import to_numbers
+
+GROUP_BY = ("oficina_servico", "periodo_referencia")
+_DATE_PARTS = ("_dia", "_mes", "_ano")       # partes de add_date_field
+
+
+# -------------------------------------------------
+# MÉTRICAS
+# -------------------------------------------------
+def metric_name(field_name):
+    """``atividade_7_pub_ext_opt`` → ``atividade_pub_ext_opt``."""
+    return re.sub(r"_\d+(?=_|$)", "", field_name)
+
+
+def numeric_field_names(manifest_or_fields):
+    """Campos numéricos (tipo ``numeric`` ou dropdown só com números)."""
+    if isinstance(manifest_or_fields, dict):
+        manifest = resolve_options(manifest_or_fields)
+    else:
+        manifest = resolve_options(build_manifest(manifest_or_fields, "-"))
+
+    names = []
+    for entry in manifest["fields"]:
+        if entry["name"] in names or entry["name"].endswith(_DATE_PARTS):
+            continue
+        options = entry.get("options") or []
+        if entry["type"] == "numeric" or (
+                entry["type"] == "dropdown" and options
+                and all(o.isdigit() for o in options)):
+            names.append(entry["name"])
+    return names
+
+
+# -------------------------------------------------
+# AGREGAÇÃO
+# -------------------------------------------------
+def aggregate_reports(records, manifest_or_fields, group_by=GROUP_BY):
+    """Soma as métricas numéricas por grupo.
+
+    ``records`` é um iterável de ``{campo: valor}`` (ex.: ``read_form_values``
+    sobre cada PDF).  Devolve um dicionário com ``groups`` (tuplas de
+    ``group_by``), ``metrics`` (nomes), ``documents`` (nº de relatórios por
+    grupo), ``sums`` e ``means`` (matrizes grupos × métricas; a média é por
+    relatório) e ``filled`` (quantos valores foram informados).
+    """
+    fields = numeric_field_names(manifest_or_fields)
+    metrics = sorted({metric_name(f) for f in fields})
+    metric_index = {m: i for i, m in enumerate(metrics)}
+
+    # streaming: guarda só o grupo de cada documento e os campos numéricos
+    group_ids = {}
+    doc_groups = []
+    columns = {f: [] for f in fields}
+    for values in records:
+        key = tuple(str(values.get(g, "") or "") for g in group_by)
+        doc_groups.append(group_ids.setdefault(key, len(group_ids)))
+        for f in fields:
+            columns[f].append(str(values.get(f, "") or "").strip())
+
+    n_docs = len(doc_groups)
+    if not n_docs:
+        empty = np.zeros((0, len(metrics)))
+        return {"groups": [], "metrics": metrics,
+                "documents": np.zeros(0, dtype=int),
+                "sums": empty, "means": empty, "filled": empty}
+
+    # documentos × campos → documentos × métricas (matriz de projeção 0/1)
+    values = np.column_stack([to_numbers(np.array(columns[f], dtype=object))
+                              for f in fields]) if fields else np.zeros((n_docs, 0))
+    projection = np.zeros((len(fields), len(metrics)))
+    for i, f in enumerate(fields):
+        projection[i, metric_index[metric_name(f)]] = 1
+
+    present = ~np.isnan(values)
+    doc_sums = np.nan_to_num(values) @ projection
+    doc_filled = present.astype(float) @ projection
+
+    # grupos em ordem alfabética
+    group_keys = sorted(group_ids)
+    rank = np.empty(len(group_keys), dtype=int)
+    rank[[group_ids[k] for k in group_keys]] = np.arange(len(group_keys))
+    inverse = rank[np.array(doc_groups)]
+    n_groups = len(group_keys)
+    sums = np.zeros((n_groups, len(metrics)))
+    filled = np.zeros((n_groups, len(metrics)))
+    np.add.at(sums, inverse, doc_sums)
+    np.add.at(filled, inverse, doc_filled)
+    documents = np.bincount(inverse, minlength=n_groups)
+
+    return {
+        "groups": group_keys,
+        "metrics": metrics,
+        "documents": documents,
+        "sums": sums,
+        "means": sums / documents[:, None],
+        "filled": filled,
+    }
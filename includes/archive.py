@@ -0,0 +1,118 @@
+# includes/archive.py
+"""
+Saída em arquivo compactado (zip/tar) gerado em fluxo.
+
+Cada PDF do lote é gravado direto no zip/tar – ou na saída padrão – assim
+que fica pronto, sem passar por arquivos intermediários.  Só o documento
+atual fica em memória, qualquer que seja o tamanho do lote.
+"""
+
+from __future__ import annotations
+import io
+import re
+import sys
+import tarfile
+import time
+import zipfile
+
+
+class _Defaults(dict):
+    """format_map que não quebra quando falta um campo no preenchimento."""
+    def __missing__(self, key):
+        return ""
+
+
+def archive_member_name(name_template, values, index):
+    """Nome do arquivo dentro do pacote a partir dos valores de preenchimento.
+
+    ``name_template`` usa os nomes dos campos (ex.:
+    ``"{oficina_servico}_{periodo_referencia}.pdf"``) e ``{n}`` = índice.
+    Se o modelo não puder ser aplicado à linha (campo ausente com formato
+    numérico, ``"{campo:04d}"`` com texto, ...) ou resultar num nome vazio
+    (``"{campo}.pdf"`` sem o campo) o nome vira ``0001.pdf`` em vez de
+    interromper o lote.
+    """
+    try:
+        name = name_template.format_map(_Defaults(values, n=index))
+    except (ValueError, TypeError, KeyError, IndexError, AttributeError):
+        name = ""
+    name = re.sub(r'[\\/:*?"<>|\s]+', "_", name).strip("_")
+    # campo ausente vira "" – ".pdf" seria um arquivo oculto sem nome
+    stem, dot, _ = name.rpartition(".")
+    if not (stem if dot else name).strip("_."):
+        return f"{index:04d}.pdf"
+    return name.lstrip("._")
+
+
+class ArchiveWriter:
+    """Grava documentos um a um num zip/tar (``target="-"`` = stdout).
+
+    ``compress=False`` (padrão) só armazena: os PDFs já vêm comprimidos.
+    """
+    def __init__(self, target, fmt="zip", compress=False):
+        if fmt not in ("zip", "tar"):
+            raise ValueError(f"Formato de arquivo desconhecido: {fmt}")
+
+        self._own_file = target != "-" and not hasattr(target, "write")
+        if target == "-":
+            fileobj = sys.stdout.buffer
+        elif self._own_file:
+            fileobj = open(target, "wb")
+        else:
+            fileobj = target
+        self._fileobj = fileobj
+        self._names = set()
+        self.count = 0
+
+        if fmt == "zip":
+            self._zip = zipfile.ZipFile(
+                fileobj, "w",
+                compression=zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+            self._tar = None
+        else:
+            self._zip = None
+            self._tar = tarfile.open(fileobj=fileobj,
+                                     mode="w|gz" if compress else "w|")
+
+    def _unique(self, name):
+        stem, dot, ext = name.rpartition(".")
+        if not dot:
+            stem, ext = name, ""
+        candidate, i = name, 1
+        while candidate in self._names:
+            i += 1
+            candidate = f"{stem}_{i}{dot}{ext}"
+        self._names.add(candidate)
+        return candidate
+
+    def add(self, name, data):
+        """Acrescenta ``data`` (bytes) como ``name``; devolve o nome usado."""
+        name = self._unique(name)
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, time.localtime()[:6])
+            info.compress_type = self._zip.compression
+            self._zip.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._tar.addfile(info, io.BytesIO(data))
+        self.count += 1
+        return name
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+        else:
+            self._tar.close()
+        if self._own_file:
+            self._fileobj.close()
+        else:
+            self._fileobj.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
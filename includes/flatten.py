@@ -0,0 +1,164 @@
+# includes/flatten.py
+"""
+Achatamento (flatten) de formulários preenchidos para arquivamento.
+
+Os valores dos campos são desenhados diretamente no conteúdo de cada página
+e os widgets interativos (texto, dropdown e rádio) são removidos.  Como a
+geometria de cada campo já é conhecida (``PDFFormField``: x, y, width,
+height, page_num) não há re‑layout: apenas um overlay por página.
+"""
+
+from __future__ import annotations
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from reportlab.pdfgen import canvas
+from reportlab.lib import colors
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, NameObject
+
+from includes.fonts import register_fonts
+
+FLATTEN_FONT_SIZE = 9
+
+
+# -------------------------------------------------
+# GEOMETRIA DOS WIDGETS
+# -------------------------------------------------
+def _widget_geometry(annot, page_num, fields_by_key):
+    """(x, y, w, h) do widget – usa o PDFFormField quando disponível."""
+    key = (page_num, annot.get("/T"), annot.get("/TU"))
+    field = fields_by_key.get(key) or fields_by_key.get(key[:2] + (None,))
+    if field is not None:
+        return field.x, field.y, field.width, field.height
+
+    x0, y0, x1, y1 = [float(v) for v in annot["/Rect"]]
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def _index_fields(fields):
+    index = {}
+    for f in fields or []:
+        index[(f.page_num, f.name, getattr(f, "radio_value", None))] = f
+    return index
+
+
+# -------------------------------------------------
+# DESENHO DOS VALORES
+# -------------------------------------------------
+def _draw_value(c, annot, x, y, w, h):
+    """Desenha o valor do widget; devolve False se não havia nada a desenhar."""
+    if annot.get("/FT") == "/Btn":
+        if annot.get("/AS", "/Off") == "/Off":
+            return False
+        c.setFillColor(colors.black)
+        c.circle(x + w / 2, y + h / 2, min(w, h) / 4, stroke=0, fill=1)
+        return True
+
+    value = annot.get("/V")
+    if not value:
+        return False
+
+    c.setFillColor(colors.black)
+    c.setFont(register_fonts()["regular"], FLATTEN_FONT_SIZE)
+    lines = str(value).splitlines() or [""]
+    if h > 30:
+        # multilinha: do topo para baixo, cortando o que não couber
+        line_y = y + h - FLATTEN_FONT_SIZE - 2
+        for line in lines:
+            if line_y < y:
+                break
+            c.drawString(x + 2, line_y, line)
+            line_y -= FLATTEN_FONT_SIZE + 2
+    else:
+        c.drawString(x + 2, y + (h - FLATTEN_FONT_SIZE) / 2 + 1, lines[0])
+    return True
+
+
+# -------------------------------------------------
+# FLATTEN DE UM ARQUIVO
+# -------------------------------------------------
+def flatten_pdf(input_filename, output_filename, fields=None):
+    """Grava em ``output_filename`` a versão achatada de ``input_filename``.
+
+    ``fields`` (opcional) é a lista de PDFFormField usada na geração;
+    quando omitida, a geometria é lida do /Rect de cada widget.
+    """
+    reader = PdfReader(input_filename)
+    writer = PdfWriter(clone_from=reader)
+    fields_by_key = _index_fields(fields)
+
+    for page_num, page in enumerate(writer.pages):
+        if "/Annots" not in page:
+            continue
+
+        width = float(page.mediabox.width)
+        height = float(page.mediabox.height)
+        overlay_buf = io.BytesIO()
+        c = canvas.Canvas(overlay_buf, pagesize=(width, height))
+
+        drawn = False
+        kept = ArrayObject()
+        for annot_ref in page["/Annots"]:
+            annot = annot_ref.get_object()
+            if annot.get("/Subtype") != "/Widget":
+                kept.append(annot_ref)
+                continue
+            x, y, w, h = _widget_geometry(annot, page_num, fields_by_key)
+            drawn = _draw_value(c, annot, x, y, w, h) or drawn
+
+        if drawn:
+            c.save()
+            overlay_buf.seek(0)
+            page.merge_page(PdfReader(overlay_buf).pages[0])
+
+        if kept:
+            page[NameObject("/Annots")] = kept
+        else:
+            del page["/Annots"]
+
+    if "/AcroForm" in writer._root_object:
+        del writer._root_object["/AcroForm"]
+
+    with open(output_filename, "wb") as out_f:
+        writer.write(out_f)
+
+    return output_filename
+
+
+# -------------------------------------------------
+# FLATTEN EM LOTE (pool de processos)
+# -------------------------------------------------
+def flatten_directory(input_dir, output_dir, fields=None, workers=None):
+    """Achata todos os PDFs de ``input_dir`` em paralelo.
+
+    No máximo ``2 * workers`` arquivos ficam em processamento ao mesmo
+    tempo, então o uso de memória não cresce com o tamanho do diretório.
+    Devolve a lista de arquivos gerados.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+
+    names = sorted(n for n in os.listdir(input_dir)
+                   if n.lower().endswith(".pdf"))
+    done_files = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for name in names:
+            if len(pending) >= max_pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                done_files.extend(f.result() for f in finished)
+
+            pending.add(pool.submit(flatten_pdf,
+                                    os.path.join(input_dir, name),
+                                    os.path.join(output_dir, name),
+                                    fields))
+
+        finished, _ = wait(pending)
+        done_files.extend(f.result() for f in finished)
+
+    print(f"{len(done_files)} PDF(s) achatado(s) → {output_dir}")
+    return sorted(done_files)
@@ -0,0 +1,128 @@
+# includes/fonts.py
+"""
+Registro das fontes usadas pelo builder.
+
+Sem ``FONT_TTF_PATH`` configurado são usadas as fontes base‑14 (Helvetica).
+Com um .ttf configurado, o subconjunto de glifos de ``FONT_CHARSET`` é
+calculado uma única vez por conjunto de caracteres (via fontTools) e
+guardado em ``FONT_CACHE_DIR``; as execuções seguintes registram direto o
+arquivo reduzido, sem repetir o subsetting nem reler a fonte completa.
+
+O ReportLab ainda monta, a cada documento, o subconjunto embutido no PDF
+(``AAAAAA+Fonte``) a partir desse arquivo.  ``CachedSubsetTTFont`` guarda
+em memória esses subconjuntos: como o template usa os mesmos caracteres na
+mesma ordem, os documentos seguintes do processo reaproveitam os bytes
+prontos (só a compressão Flate do stream continua sendo feita por documento).
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+from functools import lru_cache
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from includes.settings import (
+    FONT_TTF_PATH,
+    FONT_TTF_BOLD_PATH,
+    FONT_TTF_ITALIC_PATH,
+    FONT_CHARSET,
+    FONT_CACHE_DIR,
+)
+
+BASE14_FONTS = {
+    "regular": "Helvetica",
+    "bold": "Helvetica-Bold",
+    "italic": "Helvetica-Oblique",
+}
+
+
+# -------------------------------------------------
+# CACHE DE SUBCONJUNTOS EM DISCO
+# -------------------------------------------------
+def _subset_path(ttf_path, charset, cache_dir=FONT_CACHE_DIR):
+    """Caminho do .ttf reduzido a ``charset`` (gera se ainda não existir)."""
+    stat = os.stat(ttf_path)
+    key = hashlib.sha1(
+        f"{os.path.abspath(ttf_path)}|{stat.st_size}|{stat.st_mtime_ns}|{charset}"
+        .encode("utf-8")
+    ).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(ttf_path))[0]
+    cached = os.path.join(cache_dir, f"{stem}-{key}.ttf")
+    if os.path.isfile(cached):
+        return cached
+
+    try:
+        from fontTools import subset
+    except ImportError:
+        print("[AVISO] fontTools não instalado – usando a fonte completa "
+              f"({ttf_path}).")
+        return ttf_path
+
+    options = subset.Options()
+    options.notdef_outline = True
+    options.name_IDs = ["*"]
+    font = subset.load_font(ttf_path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=charset)
+    subsetter.subset(font)
+
+    # grava num temporário e renomeia: seguro com vários processos em paralelo
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{cached}.{os.getpid()}.tmp"
+    subset.save_font(font, tmp, options)
+    os.replace(tmp, cached)
+    return cached
+
+
+# -------------------------------------------------
+# SUBCONJUNTOS DO REPORTLAB REAPROVEITADOS ENTRE DOCUMENTOS
+# -------------------------------------------------
+class CachedSubsetTTFont(TTFont):
+    """TTFont cujo ``makeSubset`` é memoizado pela sequência de glifos.
+
+    O ReportLab numera os glifos na ordem em que aparecem no documento;
+    documentos gerados pelo mesmo template produzem a mesma sequência e,
+    portanto, o mesmo subconjunto.
+    """
+    MAX_SUBSETS = 32
+
+    def __init__(self, name, filename, **kwargs):
+        super().__init__(name, filename, **kwargs)
+        face = self.face
+        make_subset = face.makeSubset
+        cache = {}
+
+        def cached_make_subset(subset):
+            key = tuple(subset)
+            if key not in cache:
+                if len(cache) >= self.MAX_SUBSETS:
+                    cache.pop(next(iter(cache)))
+                cache[key] = make_subset(subset)
+            return cache[key]
+
+        face.makeSubset = cached_make_subset
+
+
+# -------------------------------------------------
+# REGISTRO
+# -------------------------------------------------
+@lru_cache(maxsize=None)
+def register_fonts():
+    """Devolve {"regular", "bold", "italic"} → nome da fonte no ReportLab."""
+    if not FONT_TTF_PATH:
+        return dict(BASE14_FONTS)
+
+    fonts = {}
+    for style, path in (("regular", FONT_TTF_PATH),
+                        ("bold", FONT_TTF_BOLD_PATH),
+                        ("italic", FONT_TTF_ITALIC_PATH)):
+        if not path:
+            fonts[style] = fonts["regular"]      # sem variante: usa a regular
+            continue
+        name = os.path.splitext(os.path.basename(path))[0]
+        pdfmetrics.registerFont(
+            CachedSubsetTTFont(name, _subset_path(path, FONT_CHARSET)))
+        fonts[style] = name
+    return fonts
@@ -1,6 +1,12 @@
 import datetime
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+from functools import lru_cache
+import io
+import math
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
 
 # ----------------------------------------------------------------------
 # custom helper functions
@@ -43,3 +49,68 @@ def numeric_range(start: int, stop: int, step: int = 1):
     """Retorna lista de strings numéricas de start a stop (inclusive)."""
     return [str(v) for v in range(start, stop + 1, step)]
 
+
+# -------------------------------------------------
+# métricas de texto (memoizadas – os mesmos rótulos se repetem muito)
+# -------------------------------------------------
+@lru_cache(maxsize=8192)
+def text_width(text: str, font: str, size: float) -> float:
+    """Largura de ``text`` em pontos."""
+    return stringWidth(text, font, size)
+
+@lru_cache(maxsize=2048)
+def wrap_text(text: str, font: str, size: float, max_width: float):
+    """Quebra ``text`` em linhas que cabem em ``max_width`` (tupla de linhas)."""
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if line and text_width(candidate, font, size) > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return tuple(lines)
+
+
+# -------------------------------------------------
+# logotipos reduzidos (memoizados por arquivo + perfil)
+# -------------------------------------------------
+@lru_cache(maxsize=64)
+def logo_data(path: str, max_width: float, max_height: float,
+              dpi=None, quality=None):
+    """Bytes do logotipo reduzido a ``dpi`` para a caixa max_width×max_height.
+
+    Sem ``dpi``/``quality`` devolve ``None`` (usa‑se a imagem original).
+    Com ``quality`` grava JPEG; imagens com transparência ficam em PNG.
+    """
+    if dpi is None and quality is None:
+        return None
+
+    img = Image.open(path)
+    if dpi is not None:
+        target = (math.ceil(max_width / 72 * dpi),
+                  math.ceil(max_height / 72 * dpi))
+        img.thumbnail(target, Image.LANCZOS)     # só reduz, mantém proporção
+
+    out = io.BytesIO()
+    has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+    if quality is not None and not has_alpha:
+        img.convert("RGB").save(out, "JPEG", quality=quality, optimize=True)
+    else:
+        img.save(out, "PNG", optimize=True)
+    return out.getvalue()
+
+
+def logo_image(path: str, max_width: float, max_height: float,
+               dpi=None, quality=None):
+    """Imagem para ``drawImage``: o caminho original ou um ImageReader novo.
+
+    O cache guarda só os bytes (imutáveis); cada chamada recebe o seu
+    ImageReader, que tem posição de leitura própria e não pode ser
+    compartilhado entre threads.
+    """
+    data = logo_data(path, max_width, max_height, dpi, quality)
+    return path if data is None else ImageReader(io.BytesIO(data))
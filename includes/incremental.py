@@ -0,0 +1,75 @@
+# includes/incremental.py
+"""
+Atualização incremental de formulários já gerados.
+
+Em vez de regenerar o PDF inteiro para corrigir um valor, abre o arquivo
+existente e acrescenta ao final uma seção de *incremental update* contendo
+apenas os widgets alterados.  Os bytes originais ficam intactos no início
+do arquivo (importante para a trilha de auditoria).
+"""
+
+from __future__ import annotations
+import io
+
+from pypdf import PdfWriter
+from pypdf.generic import NameObject, create_string_object
+
+
+# -------------------------------------------------
+# ATUALIZAÇÃO DE VALORES
+# -------------------------------------------------
+def update_form_values(input_filename, values, output_filename=None):
+    """Altera os valores dos campos em ``values`` ({nome: valor}).
+
+    Se ``output_filename`` for omitido o próprio arquivo de entrada é
+    atualizado.  Devolve a lista de nomes efetivamente alterados.
+    """
+    writer = PdfWriter(input_filename, incremental=True)
+
+    updated = set()
+    for page in writer.pages:
+        for annot_ref in page.get("/Annots", []):
+            annot = annot_ref.get_object()
+            name = annot.get("/T")
+            if name not in values:
+                continue
+
+            value = str(values[name])
+            if annot.get("/FT") == "/Btn":
+                # rádio: cada opção é um widget com o mesmo nome (/TU = opção)
+                state = NameObject("/On" if annot.get("/TU") == value else "/Off")
+                if annot.get("/AS") == state:
+                    continue
+                annot[NameObject("/AS")] = state
+                annot[NameObject("/V")] = state
+            else:
+                if annot.get("/V") == value:
+                    continue
+                annot[NameObject("/V")] = create_string_object(value)
+            updated.add(name)
+
+    for name in values:
+        if name not in updated and not _has_field(writer, name):
+            print(f"[AVISO] Campo não encontrado: {name}")
+
+    if not updated:
+        return []
+
+    # grava em memória antes de sobrescrever (a entrada ainda está aberta)
+    out = io.BytesIO()
+    writer.write(out)
+    writer.close()
+
+    output_filename = output_filename or input_filename
+    with open(output_filename, "wb") as out_f:
+        out_f.write(out.getvalue())
+
+    return sorted(updated)
+
+
+def _has_field(writer, name):
+    for page in writer.pages:
+        for annot_ref in page.get("/Annots", []):
+            if annot_ref.get_object().get("/T") == name:
+                return True
+    return False
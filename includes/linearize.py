@@ -0,0 +1,54 @@
+# includes/linearize.py
+"""
+Saída linearizada ("fast web view").
+
+Num PDF linearizado o dicionário /Linearized, os objetos da 1ª página e as
+tabelas de dicas (hint tables) ficam no início do arquivo: o navegador
+mostra – e permite preencher – a página 1 enquanto o resto ainda chega.
+A linearização é feita pelo qpdf (via pikepdf, dependência opcional).
+"""
+
+from __future__ import annotations
+import io
+import re
+
+
+def write_linearized(pdf_bytes, output_filename):
+    """Grava ``pdf_bytes`` linearizado em ``output_filename``."""
+    import pikepdf          # opcional: pip install pikepdf
+
+    with pikepdf.open(io.BytesIO(pdf_bytes)) as pdf:
+        pdf.save(output_filename, linearize=True)
+    return output_filename
+
+
+def linearization_info(filename):
+    """Dicionário /Linearized do arquivo (``{}`` se não for linearizado).
+
+    Lê só o primeiro KB – é onde o dicionário precisa estar.  As chaves
+    interessantes são ``L`` (tamanho do arquivo), ``E`` (fim da 1ª página),
+    ``O`` (objeto da 1ª página), ``N`` (nº de páginas) e ``H`` (hint tables).
+    """
+    with open(filename, "rb") as src:
+        head = src.read(1024)
+
+    match = re.search(rb"<<\s*/Linearized\s.*?>>", head, re.S)
+    if not match:
+        return {}
+
+    info = {}
+    for key, value in re.findall(rb"/(\w+)\s+(\[[^\]]*\]|[\d.]+)",
+                                 match.group(0)):
+        numbers = [int(float(v)) for v in re.findall(rb"[\d.]+", value)]
+        info[key.decode()] = numbers if value.startswith(b"[") else numbers[0]
+    return info
+
+
+def is_linearized(filename):
+    """True se o arquivo tem /Linearized válido (/L igual ao tamanho real)."""
+    info = linearization_info(filename)
+    if not info:
+        return False
+    with open(filename, "rb") as src:
+        size = src.seek(0, io.SEEK_END)
+    return info.get("L") == size and info.get("E", size + 1) <= size
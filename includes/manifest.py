@@ -0,0 +1,113 @@
+# includes/manifest.py
+"""
+Manifesto de campos (sidecar JSON) gerado junto com o PDF.
+
+Contém tudo o que ``PDFFormBuilder.fields`` já sabe no momento da geração –
+nome, tipo, página, geometria, obrigatoriedade, opções e faixas numéricas –
+para que leitores, validadores e preenchedores não precisem percorrer
+``/Annots`` do PDF.  As listas de opções são gravadas uma única vez e
+referenciadas por índice; o manifesto é identificado pelo hash do template.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+# arquivos cujo conteúdo define o layout (entram no hash do template):
+# main.py tem a geometria dos add_*; fonts.py as métricas (quebra de linha)
+_TEMPLATE_FILES = (
+    "main.py",
+    "includes/template.py",
+    "includes/settings.py",
+    "includes/helpers.py",
+    "includes/fonts.py",
+)
+
+
+# -------------------------------------------------
+# HASH DO TEMPLATE
+# -------------------------------------------------
+def template_hash():
+    """Hash (hex, 16 caracteres) dos arquivos que definem o template."""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for name in _TEMPLATE_FILES:
+        with open(os.path.join(base_dir, name), "rb") as src:
+            digest.update(src.read())
+    return digest.hexdigest()[:16]
+
+
+def manifest_filename(pdf_filename):
+    """``relatorio.pdf`` → ``relatorio.fields.json``."""
+    return os.path.splitext(pdf_filename)[0] + ".fields.json"
+
+
+# -------------------------------------------------
+# CONSTRUÇÃO / LEITURA
+# -------------------------------------------------
+def build_manifest(fields, hash_=None):
+    """Dicionário serializável a partir da lista de PDFFormField."""
+    options = []
+    options_index = {}
+    entries = []
+
+    for f in fields:
+        entry = {
+            "name": f.name,
+            "type": f.field_type,
+            "page": f.page_num,
+            "rect": [round(v, 2) for v in (f.x, f.y, f.width, f.height)],
+        }
+        if f.required:
+            entry["required"] = True
+        if f.field_type == "radio":
+            entry["value"] = getattr(f, "radio_value", None)
+        elif f.options:
+            key = tuple(f.options)
+            if key not in options_index:
+                options_index[key] = len(options)
+                options.append(list(key))
+            entry["options"] = options_index[key]
+        for attr, key in (("min_value", "min"), ("max_value", "max"),
+                          ("decimals", "decimals")):
+            value = getattr(f, attr, None)
+            if value is not None:
+                entry[key] = value
+        entries.append(entry)
+
+    return {
+        "version": MANIFEST_VERSION,
+        "template_hash": hash_ or template_hash(),
+        "options": options,
+        "fields": entries,
+    }
+
+
+def write_manifest(fields, filename, hash_=None):
+    """Grava o manifesto compacto (JSON sem espaços) em ``filename``."""
+    manifest = build_manifest(fields, hash_)
+    with open(filename, "w", encoding="utf-8") as out_f:
+        json.dump(manifest, out_f, ensure_ascii=False, separators=(",", ":"))
+    return filename
+
+
+def load_manifest(filename):
+    """Lê o manifesto e resolve as referências de opções em cada campo."""
+    with open(filename, encoding="utf-8") as src:
+        manifest = json.load(src)
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Versão de manifesto não suportada: {filename}")
+    return resolve_options(manifest)
+
+
+def resolve_options(manifest):
+    """Troca o índice ``options`` de cada campo pela lista correspondente."""
+    options = manifest["options"]
+    for entry in manifest["fields"]:
+        if isinstance(entry.get("options"), int):
+            entry["options"] = options[entry["options"]]
+    return manifest
@@ -0,0 +1,94 @@
+# includes/merge.py
+"""
+Junção de vários formulários preenchidos num único PDF.
+
+Como todas as cópias usam os mesmos nomes de campo (``oficina_servico``,
+``data_reuniao_1_dia``, ...), cada documento de origem ganha um campo‑pai
+próprio: os widgets passam a se chamar ``<prefixo>.<nome>``.  As listas
+``/Opt`` repetidas são gravadas uma única vez e, no final, objetos idênticos
+(fontes, logos, ...) são deduplicados.
+"""
+
+from __future__ import annotations
+import os
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    BooleanObject,
+    DictionaryObject,
+    NameObject,
+    create_string_object,
+)
+
+
+def _default_prefix(filename, index):
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    # "." separa níveis na hierarquia de campos – não pode aparecer no prefixo
+    return f"doc{index + 1:03d}_{stem.replace('.', '_')}"
+
+
+# -------------------------------------------------
+# JUNÇÃO
+# -------------------------------------------------
+def merge_forms(input_filenames, output_filename, prefixes=None):
+    """Junta ``input_filenames`` em ``output_filename``.
+
+    ``prefixes`` (opcional) define o nome do campo‑pai de cada documento;
+    por padrão ``doc001_<arquivo>``, ``doc002_<arquivo>``, ...  Os arquivos
+    de entrada são lidos um de cada vez e liberados em seguida.
+    """
+    writer = PdfWriter()
+    top_fields = ArrayObject()
+    shared_opts = {}            # tupla de opções → referência indireta única
+
+    for index, filename in enumerate(input_filenames):
+        prefix = prefixes[index] if prefixes else _default_prefix(filename, index)
+
+        parent = DictionaryObject(
+            {
+                NameObject("/T"): create_string_object(prefix),
+                NameObject("/Kids"): ArrayObject(),
+            }
+        )
+        parent_ref = writer._add_object(parent)
+
+        reader = PdfReader(filename)
+        for page in reader.pages:
+            new_page = writer.add_page(page)
+            for annot_ref in new_page.get("/Annots", []):
+                annot = annot_ref.get_object()
+                if annot.get("/Subtype") != "/Widget" or "/T" not in annot:
+                    continue
+
+                annot[NameObject("/Parent")] = parent_ref
+                parent["/Kids"].append(annot_ref)
+
+                if "/Opt" in annot:
+                    key = tuple(str(o) for o in annot["/Opt"])
+                    if key not in shared_opts:
+                        shared_opts[key] = writer._add_object(
+                            ArrayObject(annot["/Opt"]))
+                    annot[NameObject("/Opt")] = shared_opts[key]
+
+        top_fields.append(parent_ref)
+        del reader
+
+    writer._root_object[NameObject("/AcroForm")] = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Fields"): top_fields,
+                NameObject("/NeedAppearances"): BooleanObject(True),
+            }
+        )
+    )
+
+    # fontes, imagens e demais objetos idênticos entre os documentos
+    writer.compress_identical_objects(remove_identicals=True,
+                                      remove_orphans=True)
+
+    with open(output_filename, "wb") as out_f:
+        writer.write(out_f)
+
+    print(f"{len(top_fields)} formulário(s) juntado(s) → {output_filename}")
+    return output_filename
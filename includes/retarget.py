@@ -0,0 +1,59 @@
+# includes/retarget.py
+"""
+Re‑enquadramento de um layout já compilado para outro tamanho de página.
+
+O layout compilado é o PDF estático desenhado pelo builder (operações de
+desenho) + a lista de ``PDFFormField``.  Para gerar uma variante Letter/A5
+não é preciso executar o ``build`` de novo: calcula‑se uma transformação
+(escala uniforme + centralização) e ela é aplicada ao conteúdo de cada
+página e aos retângulos dos widgets.
+"""
+
+from __future__ import annotations
+import copy
+import io
+
+from pypdf import PdfReader, PdfWriter, Transformation
+from pypdf.generic import RectangleObject
+
+
+def page_transform(src_size, dst_size):
+    """(escala, dx, dy) que encaixa ``src_size`` em ``dst_size``, centralizado."""
+    src_w, src_h = src_size
+    dst_w, dst_h = dst_size
+    scale = min(dst_w / src_w, dst_h / src_h)
+    return scale, (dst_w - src_w * scale) / 2, (dst_h - src_h * scale) / 2
+
+
+def retarget_field(field, scale, dx, dy):
+    """Cópia do PDFFormField com a geometria transformada."""
+    new = copy.copy(field)
+    new.x = field.x * scale + dx
+    new.y = field.y * scale + dy
+    new.width = field.width * scale
+    new.height = field.height * scale
+    return new
+
+
+def retarget_layout(pdf_bytes, fields, pagesize):
+    """Devolve ``(pdf_bytes, fields)`` re‑enquadrados em ``pagesize``."""
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    writer = PdfWriter()
+
+    transforms = []
+    for page in reader.pages:
+        src_size = (float(page.mediabox.width), float(page.mediabox.height))
+        scale, dx, dy = page_transform(src_size, pagesize)
+        page.add_transformation(Transformation().scale(scale).translate(dx, dy))
+        page.mediabox = RectangleObject([0, 0, pagesize[0], pagesize[1]])
+        if "/CropBox" in page:
+            page.cropbox = page.mediabox
+        # add_transformation grava o conteúdo descomprimido; o pypdf só
+        # recomprime páginas que já pertencem ao writer
+        writer.add_page(page).compress_content_streams()
+        transforms.append((scale, dx, dy))
+
+    out = io.BytesIO()
+    writer.write(out)
+    new_fields = [retarget_field(f, *transforms[f.page_num]) for f in fields]
+    return out.getvalue(), new_fields
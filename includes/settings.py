@@ -1,6 +1,7 @@
 from reportlab.lib.pagesizes import A4
 
 PDF_FILENAME = "relatorio_mensal_oficinas_.pdf"
+WORKER_OUTPUT_DIR = "."           # única pasta onde o worker (main.py serve) grava
 
 # -------------------------------------------------
 # CONFIGURAÇÕES DE PÁGINA
@@ -32,6 +33,38 @@ LABEL_SPACING      = 6    # espaço extra entre rótulo e caixa
 DEFAULT_PAD_X = 6   # pontos à esquerda e à direita
 DEFAULT_PAD_Y = 4   # pontos acima e abaixo
 
+# -------------------------------------------------
+# OTIMIZAÇÃO DO CONTEÚDO DAS PÁGINAS
+# -------------------------------------------------
+# Une drawString consecutivos (e as trocas de fonte/cor entre eles) num único
+# bloco de texto BT … ET – conteúdo menor, mesma renderização.
+COALESCE_TEXT_RUNS = False
+
+# -------------------------------------------------
+# Verifica, durante o build, widgets sobrepostos, fora da página ou fora das
+# margens (índice espacial em grade – custo desprezível, pode ficar ligado).
+CHECK_LAYOUT = True
+
+# -------------------------------------------------
+# PERFIS DE SAÍDA (tamanho × velocidade)
+# -------------------------------------------------
+#   page_compression – compressão do conteúdo pelo ReportLab (0 = nenhuma)
+#   compress_level   – nível zlib (0‑9) ao regravar as páginas; None = mantém
+#   logo_dpi         – resolução alvo dos logotipos; None = resolução original
+#   logo_quality     – qualidade JPEG dos logotipos; None = PNG sem perdas
+#   use_a85          – codifica imagens/conteúdo também em ASCII85 (+25 % no
+#                      stream, só útil para PDF "texto puro"); ausente = padrão
+#                      do ReportLab (ligado)
+OUTPUT_PROFILES = {
+    "fast":  {"page_compression": 0, "compress_level": None,
+              "logo_dpi": 150,  "logo_quality": None, "use_a85": False},
+    "email": {"page_compression": 1, "compress_level": 9,
+              "logo_dpi": 96,   "logo_quality": 70,   "use_a85": False},
+    "print": {"page_compression": 1, "compress_level": 6,
+              "logo_dpi": 300,  "logo_quality": None, "use_a85": False},
+}
+OUTPUT_PROFILE = None             # None = padrões do ReportLab (sem perfil)
+
 # -------------------------------------------------
 # LOGOTIPOS (vários) – ajuste o caminho/dimensões conforme necessário
 # -------------------------------------------------
@@ -48,3 +81,21 @@ LOGO_PATHS = [
 LOGO_SPACING = 10                 # espaço entre um logo e outro (pts)
 LOGO_MAX_HEIGHT = 40              # altura máxima de cada logo (pts)
 LOGO_MAX_WIDTH  = 40             # largura máxima de cada logo (pts)
+
+# -------------------------------------------------
+# FONTES – TrueType opcional (None = fontes base‑14 Helvetica)
+# -------------------------------------------------
+# As fontes base‑14 não têm o glifo "▼" e falham em parte do texto em
+# português.  Aponte para um .ttf (ex.: DejaVuSans) para embuti‑lo.
+FONT_TTF_PATH        = None       # ex.: "fonts/DejaVuSans.ttf"
+FONT_TTF_BOLD_PATH   = None       # ex.: "fonts/DejaVuSans-Bold.ttf"
+FONT_TTF_ITALIC_PATH = None       # ex.: "fonts/DejaVuSans-Oblique.ttf"
+
+# Caracteres mantidos no subconjunto da fonte (calculado uma vez e guardado
+# em FONT_CACHE_DIR entre execuções).
+FONT_CHARSET = (
+    "".join(chr(c) for c in range(32, 127))
+    + "".join(chr(c) for c in range(160, 256))
+    + "‑–—‘’“”•…▼"
+)
+FONT_CACHE_DIR = ".font_cache"
@@ -0,0 +1,48 @@
+# includes/submissions.py
+"""
+Leitura dos valores de formulários devolvidos (preenchidos).
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+
+from pypdf import PdfReader
+
+
+def read_form_values(filename):
+    """{nome_do_campo: valor} de um PDF gerado pelo builder.
+
+    Campos vazios voltam como ``""``; em grupos de rádio o valor é a opção
+    marcada (/TU do widget com /AS diferente de /Off).
+    """
+    values = {}
+    for page in PdfReader(filename).pages:
+        for annot_ref in page.get("/Annots", []):
+            annot = annot_ref.get_object()
+            name = annot.get("/T")
+            if name is None:
+                continue
+            if annot.get("/FT") == "/Btn":
+                values.setdefault(name, "")
+                if annot.get("/AS", "/Off") != "/Off":
+                    values[name] = str(annot.get("/TU", ""))
+            else:
+                values[name] = str(annot.get("/V", ""))
+    return values
+
+
+def iter_form_values(filenames, workers=None):
+    """Gera ``(arquivo, valores)`` na ordem de ``filenames``.
+
+    Com ``workers`` > 1 a leitura (dominada pelo parse do PDF) é feita num
+    pool de processos; só os dicionários de valores voltam ao chamador.
+    """
+    if not workers or workers <= 1:
+        for filename in filenames:
+            yield filename, read_form_values(filename)
+        return
+
+    filenames = list(filenames)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from zip(filenames,
+                       pool.map(read_form_values, filenames, chunksize=8))
@@ -40,15 +40,7 @@ def build(self: "PDFFormBuilder") -> tuple[io.BytesIO, list[PDFFormField]]:
             print(f"[AVISO] Logotipo não encontrado: {logo_path}")
             continue
 
-        self.canvas.drawImage(
-            logo_path,
-            cur_x,
-            logo_base_y,
-            width=self.LOGO_MAX_WIDTH,
-            height=self.LOGO_MAX_HEIGHT,
-            preserveAspectRatio=True,
-            mask='auto',
-        )
+        self.draw_logo(logo_path, cur_x, logo_base_y)
         cur_x += self.LOGO_MAX_WIDTH + self.LOGO_SPACING
 
     # posiciona o cursor logo abaixo da linha de logos
@@ -57,14 +49,14 @@ def build(self: "PDFFormBuilder") -> tuple[io.BytesIO, list[PDFFormField]]:
     # -------------------------------------------------
     # 2️⃣  TÍTULO PRINCIPAL
     # -------------------------------------------------
-    self.canvas.setFont("Helvetica-Bold", 16)
+    self.canvas.setFont(self.FONT_BOLD, 16)
     self.canvas.drawString(self.MARGIN_LEFT, self.y_pos,
                            "RELATÓRIO MENSAL DAS OFICINAS")
     self.y_pos -= 20
     self.canvas.drawString(self.MARGIN_LEFT, self.y_pos, "RP CSA NASF")
     self.y_pos -= 30
 
-    self.canvas.setFont("Helvetica", 10)
+    self.canvas.setFont(self.FONT, 10)
     self.canvas.drawString(self.MARGIN_LEFT, self.y_pos,
                            "Este formulário padroniza o Relatório Mensal de Serviço.")
     self.y_pos -= 15
@@ -159,12 +151,12 @@ def build(self: "PDFFormBuilder") -> tuple[io.BytesIO, list[PDFFormField]]:
         self.add_date_field(f"data_reuniao_{i}",
                             f"Data da Reunião Nº {i}")
 
-        # Membros Presentes (texto + dropdown 0‑100)
+        # Membros Presentes (texto + número 0‑100)
         self.add_text_with_dropdown(
             name_text=f"membros_presentes_{i}_txt",
             name_dropdown=f"membros_presentes_{i}_opt",
             label=f"Membros Presentes (Nº {i})",
-            dropdown_options=numeric_range(0, 100),
+            value_range=(0, 100),
             help_text="Total de companheiros (Mesa, Servidores, Membros Interessados) presentes.",
         )
 
@@ -176,28 +168,32 @@ def build(self: "PDFFormBuilder") -> tuple[io.BytesIO, list[PDFFormField]]:
         )
 
         # Quantitativos associados ao parágrafo acima
-        self.add_dropdown_field(
+        self.add_numeric_field(
             f"grupos_csa_{i}",
             "Grupos do CSA representados",
-            numeric_range(0, 20),
+            min_value=0,
+            max_value=20,
             help_text="Número de grupos do CSA presentes.",
         )
-        self.add_dropdown_field(
+        self.add_numeric_field(
             f"representantes_mesa_{i}",
             "Representantes da Mesa do CSA",
-            numeric_range(0, 10),
+            min_value=0,
+            max_value=10,
             help_text="Quantos representantes da Mesa do CSA estavam presentes.",
         )
-        self.add_dropdown_field(
+        self.add_numeric_field(
             f"outros_csas_{i}",
             "Outros CSAs representados",
-            numeric_range(0, 10),
+            min_value=0,
+            max_value=10,
             help_text="Outros CSAs que enviaram representantes.",
         )
-        self.add_dropdown_field(
+        self.add_numeric_field(
             f"outras_estruturas_{i}",
             "Outras estruturas de Serviço",
-            numeric_range(0, 10),
+            min_value=0,
+            max_value=10,
             help_text="Outras estruturas (ex.: RC, CSAP) que marcaram presença.",
         )
 
@@ -251,7 +247,7 @@ def build(self: "PDFFormBuilder") -> tuple[io.BytesIO, list[PDFFormField]]:
             name_text=f"{prefix}_pub_int_txt",
             name_dropdown=f"{prefix}_pub_int_opt",
             label="3. Público Interno Alcançado",
-            dropdown_options=alcance_impacto_options(),
+            value_range=(0, 10000),
             required=False,
             help_text="Companheiros de NA (Membros da Oficina/Outras Estruturas) presentes.",
         )
@@ -261,16 +257,17 @@ def build(self: "PDFFormBuilder") -> tuple[io.BytesIO, list[PDFFormField]]:
             name_text=f"{prefix}_pub_ext_txt",
             name_dropdown=f"{prefix}_pub_ext_opt",
             label="4. Público Externo Alcançado",
-            dropdown_options=alcance_impacto_options(),
+            value_range=(0, 10000),
             required=False,
             help_text="Residentes/Pacientes, Profissionais de Saúde/Segurança, Público em Geral.",
         )
 
         # 5. Nº de Servidores
-        self.add_dropdown_field(
+        self.add_numeric_field(
             name=f"{prefix}_servidores",
             label="5. Nº de Servidores Envolvidos",
-            options=numeric_range(0, 50),
+            min_value=0,
+            max_value=50,
             required=False,
             width=100,
             help_text="Total de membros que trabalharam na atividade.",
@@ -287,7 +284,7 @@ def build(self: "PDFFormBuilder") -> tuple[io.BytesIO, list[PDFFormField]]:
         name_text="membros_ativos_txt",
         name_dropdown="membros_ativos_opt",
         label="Membros Ativos no Serviço da Oficina",
-        dropdown_options=numeric_range(0, 50),
+        value_range=(0, 50),
         required=True,
         help_text="Número de membros que prestaram serviço ativamente (exceto Mesa).",
     )
@@ -296,7 +293,7 @@ def build(self: "PDFFormBuilder") -> tuple[io.BytesIO, list[PDFFormField]]:
         name_text="documentos_criados_txt",
         name_dropdown="documentos_criados_opt",
         label="Número de Documentos Criados/Revisados",
-        dropdown_options=numeric_range(0, 50),
+        value_range=(0, 50),
         required=True,
         help_text="Ex: Guia de Procedimentos, Manual de Capacitação, etc.",
     )
@@ -0,0 +1,162 @@
+# includes/validation.py
+"""
+Validação em lote de formulários devolvidos.
+
+As submissões ({campo: valor}) são carregadas em colunas NumPy – uma por
+campo – e cada regra é avaliada de uma vez para todos os documentos:
+
+* obrigatórios (``required``) não podem estar vazios;
+* dropdowns / rádios só aceitam valores de ``options``;
+* campos numéricos precisam ser números dentro de ``min``/``max``;
+* as três partes de cada ``add_date_field`` (_dia/_mes/_ano) precisam
+  formar uma data real.
+
+As conversões de texto (número, mês, ...) são feitas só sobre os valores
+distintos de cada coluna (``np.unique``) e espalhadas de volta por índice.
+"""
+
+from __future__ import annotations
+from collections import Counter
+
+import numpy as np
+
+from includes.helpers import generate_month_options
+from includes.manifest import build_manifest, resolve_options
+
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+_MONTHS = {name: i + 1 for i, name in enumerate(generate_month_options())}
+
+
+# -------------------------------------------------
+# COLUNAS
+# -------------------------------------------------
+def _column(submissions, name):
+    return np.array([str(s.get(name, "") or "").strip() for s in submissions],
+                    dtype=object)
+
+
+def _map_unique(col, convert, missing=np.nan):
+    """Aplica ``convert`` a cada valor distinto de ``col`` (float; nan = inválido)."""
+    uniq, inverse = np.unique(col, return_inverse=True)
+    mapped = np.empty(len(uniq), dtype=float)
+    for i, text in enumerate(uniq):
+        try:
+            mapped[i] = convert(text)
+        except (TypeError, ValueError, KeyError):
+            mapped[i] = missing
+    return mapped[inverse]
+
+
+def _to_number(text):
+    return float(text.replace(",", "."))
+
+
+def to_numbers(col):
+    """Coluna de textos → floats (aceita vírgula decimal; nan = vazio/inválido)."""
+    return _map_unique(col, _to_number)
+
+
+def _field_specs(manifest_or_fields):
+    """{nome: spec} – aceita o manifesto carregado ou a lista de PDFFormField."""
+    if isinstance(manifest_or_fields, dict):
+        manifest = resolve_options(manifest_or_fields)
+    else:
+        manifest = resolve_options(build_manifest(manifest_or_fields, "-"))
+
+    specs = {}
+    for entry in manifest["fields"]:
+        spec = specs.setdefault(entry["name"], dict(entry))
+        if entry["type"] == "radio":
+            spec.setdefault("values", []).append(entry.get("value"))
+        spec["required"] = spec.get("required") or entry.get("required", False)
+    return specs
+
+
+# -------------------------------------------------
+# VALIDAÇÃO
+# -------------------------------------------------
+def validate_submissions(submissions, manifest_or_fields):
+    """Valida todas as submissões de uma vez.
+
+    Devolve ``(relatorios, resumo)``: ``relatorios[i]`` é a lista de erros
+    do documento ``i`` e ``resumo`` traz as contagens agregadas.
+    """
+    submissions = list(submissions)
+    n = len(submissions)
+    specs = _field_specs(manifest_or_fields)
+    columns = {name: _column(submissions, name) for name in specs}
+    empty = {name: col == "" for name, col in columns.items()}
+
+    errors = []        # (regra, campo, máscara, mensagem)
+
+    for name, spec in specs.items():
+        col = columns[name]
+        if spec.get("required"):
+            errors.append(("required", name, empty[name], "campo obrigatório"))
+
+        allowed = spec.get("values") if spec["type"] == "radio" else spec.get("options")
+        if spec["type"] in ("dropdown", "radio") and allowed:
+            bad = ~empty[name] & ~np.isin(col, np.array(allowed, dtype=object))
+            errors.append(("options", name, bad, "valor fora da lista"))
+
+        if spec["type"] == "numeric":
+            values = to_numbers(col)
+            not_number = ~empty[name] & np.isnan(values)
+            errors.append(("number", name, not_number, "não é um número"))
+            with np.errstate(invalid="ignore"):
+                out_of_range = np.zeros(n, dtype=bool)
+                if spec.get("min") is not None:
+                    out_of_range |= values < spec["min"]
+                if spec.get("max") is not None:
+                    out_of_range |= values > spec["max"]
+            errors.append(("range", name, out_of_range,
+                           f"fora da faixa {spec.get('min')}–{spec.get('max')}"))
+
+    # datas: <prefixo>_dia / _mes / _ano
+    for name in specs:
+        if not name.endswith("_dia"):
+            continue
+        prefix = name[:-4]
+        parts = (f"{prefix}_dia", f"{prefix}_mes", f"{prefix}_ano")
+        if not all(p in specs for p in parts):
+            continue
+
+        day = _map_unique(columns[parts[0]], int)
+        month = _map_unique(columns[parts[1]], _MONTHS.__getitem__)
+        year = _map_unique(columns[parts[2]], int)
+
+        filled = np.stack([~empty[p] for p in parts])
+        incomplete = filled.any(axis=0) & ~filled.all(axis=0)
+        errors.append(("date", prefix, incomplete, "data incompleta"))
+
+        complete = filled.all(axis=0) & ~np.isnan(day + month + year)
+        m = np.where(complete, month, 1).astype(int)
+        y = np.where(complete, year, 2000).astype(int)
+        leap = (y % 4 == 0) & ((y % 100 != 0) | (y % 400 == 0))
+        last_day = _DAYS_IN_MONTH[m - 1] + ((m == 2) & leap)
+        invalid = complete & ((day < 1) | (day > last_day))
+        errors.append(("date", prefix, invalid, "data inexistente"))
+
+    # -------------------------------------------------
+    # relatórios por documento + resumo
+    # -------------------------------------------------
+    reports = [[] for _ in range(n)]
+    by_rule = Counter()
+    by_field = Counter()
+    for rule, name, mask, message in errors:
+        hits = np.flatnonzero(mask)
+        if not len(hits):
+            continue
+        by_rule[rule] += len(hits)
+        by_field[name] += len(hits)
+        for i in hits:
+            reports[i].append(f"{name}: {message}")
+
+    summary = {
+        "documents": n,
+        "invalid_documents": sum(1 for r in reports if r),
+        "errors": sum(by_rule.values()),
+        "by_rule": dict(by_rule),
+        "by_field": dict(by_field),
+    }
+    return reports, summary
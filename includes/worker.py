@@ -0,0 +1,249 @@
+# includes/worker.py
+"""
+Modo worker: processo de longa duração que recarrega só o template.
+
+O ``main.py`` liga ``PDFFormBuilder.build`` a ``includes.template.build``
+na importação, então cada edição do template exigia um processo novo (e
+perdia imports, fontes registradas, logotipos e métricas de texto já em
+cache).  O worker observa os arquivos do template e, quando algum muda:
+
+* ``template.py``  → ``importlib.reload`` só desse módulo e religa o ``build``;
+* logotipos        → descarta o cache de ``logo_data``;
+* ``settings.py`` / ``helpers.py`` → apenas avisa: são importados com ``*``
+  em vários módulos e só são relidos reiniciando o worker.
+
+As regerações são pedidas por um socket local (uma linha JSON por pedido,
+uma linha JSON de resposta).  Cliente de linha de comando::
+
+    python main.py serve                       # inicia o worker
+    python -m includes.worker relatorio.pdf --profile email
+"""
+
+from __future__ import annotations
+import argparse
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+
+DEFAULT_ADDRESS = ("127.0.0.1", 8765)
+# únicos parâmetros de create_pdf_form aceitos pelo socket
+_REQUEST_KEYS = {"filename", "profile", "linearize", "manifest", "pagesize"}
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# -------------------------------------------------
+# OBSERVAÇÃO DOS ARQUIVOS
+# -------------------------------------------------
+class TemplateWatcher:
+    """Acompanha o mtime de uma lista de arquivos (polling, sem dependências)."""
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self._mtimes = self._snapshot()
+
+    def _snapshot(self):
+        mtimes = {}
+        for path in self.paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def changed(self):
+        """Arquivos alterados desde a última chamada."""
+        now = self._snapshot()
+        changed = [p for p in self.paths if now[p] != self._mtimes[p]]
+        self._mtimes = now
+        return changed
+
+
+# -------------------------------------------------
+# WORKER
+# -------------------------------------------------
+class TemplateWorker:
+    """Regera o PDF sob demanda, recarregando o template quando ele muda.
+
+    ``builder_cls`` é a classe cujo ``build`` é religado a cada recarga e
+    ``generate`` a função que grava o PDF (``create_pdf_form``), chamada com
+    os parâmetros de cada pedido.  Os pedidos só podem gravar ``.pdf`` (e o
+    manifesto ao lado) dentro de ``output_dir``; ``profiles`` são os perfis
+    aceitos.
+    """
+    def __init__(self, builder_cls, generate, logo_paths=(), output_dir=".",
+                 default_filename="formulario.pdf", profiles=()):
+        self.builder_cls = builder_cls
+        self.generate = generate
+        self.output_dir = os.path.realpath(output_dir)
+        self.default_filename = default_filename
+        self.profiles = set(profiles)
+        self.template_path = os.path.join(_BASE_DIR, "template.py")
+        self.restart_paths = [os.path.join(_BASE_DIR, name)
+                              for name in ("settings.py", "helpers.py")]
+        self.logo_paths = [os.path.abspath(p) for p in logo_paths]
+        self.watcher = TemplateWatcher([self.template_path, *self.restart_paths,
+                                        *self.logo_paths])
+        self.template_error = None
+
+    def refresh(self):
+        """Aplica as alterações pendentes; devolve os arquivos recarregados."""
+        changed = self.watcher.changed()
+        if not changed:
+            return []
+
+        if any(p in self.logo_paths for p in changed):
+            from includes.helpers import logo_data
+            logo_data.cache_clear()
+
+        for path in changed:
+            if path in self.restart_paths:
+                print(f"[AVISO] {os.path.basename(path)} alterado – "
+                      "reinicie o worker para aplicar")
+
+        if self.template_path in changed:
+            import includes.template
+            try:
+                module = importlib.reload(includes.template)
+            except Exception as exc:
+                # mantém o build anterior até o template voltar a compilar
+                self.template_error = f"{type(exc).__name__}: {exc}"
+                print(f"[AVISO] Template com erro: {self.template_error}")
+            else:
+                self.builder_cls.build = module.build
+                self.template_error = None
+                print("Template recarregado.")
+        return [os.path.basename(p) for p in changed]
+
+    def _output_path(self, filename):
+        """Caminho final de ``filename`` – sempre dentro de ``output_dir``."""
+        if not isinstance(filename, str) or not filename.lower().endswith(".pdf"):
+            raise ValueError("filename deve ser um nome de arquivo .pdf")
+        path = os.path.realpath(os.path.join(self.output_dir, filename))
+        if os.path.commonpath([path, self.output_dir]) != self.output_dir:
+            raise ValueError(f"filename fora de {self.output_dir}")
+        return path
+
+    def check_request(self, request):
+        """Parâmetros de ``generate`` validados (ValueError se inválidos)."""
+        if not isinstance(request, dict):
+            raise ValueError("o pedido deve ser um objeto JSON")
+        unknown = sorted(set(request) - _REQUEST_KEYS)
+        if unknown:
+            raise ValueError(f"parâmetro(s) não aceito(s): {', '.join(unknown)}")
+
+        params = {"filename": self._output_path(
+            request.get("filename") or self.default_filename)}
+        profile = request.get("profile")
+        if profile is not None:
+            if profile not in self.profiles:
+                raise ValueError(f"perfil desconhecido: {profile}")
+            params["profile"] = profile
+        for key in ("linearize", "manifest"):
+            if key in request:
+                if not isinstance(request[key], bool):
+                    raise ValueError(f"{key} deve ser true/false")
+                params[key] = request[key]
+        pagesize = request.get("pagesize")
+        if pagesize is not None:
+            if not (isinstance(pagesize, list) and len(pagesize) == 2
+                    and all(isinstance(v, (int, float)) and 0 < v <= 14400
+                            for v in pagesize)):
+                raise ValueError("pagesize deve ser [largura, altura] em pts")
+            params["pagesize"] = tuple(pagesize)
+        return params
+
+    def handle(self, request):
+        """Processa um pedido (dicionário) e devolve a resposta."""
+        started = time.perf_counter()
+        try:
+            params = self.check_request(request)
+        except ValueError as exc:
+            return {"ok": False, "error": f"pedido recusado: {exc}",
+                    "reloaded": []}
+        reloaded = self.refresh()
+        try:
+            self.generate(**params)
+        except Exception as exc:
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}",
+                    "reloaded": reloaded}
+        return {
+            "ok": True,
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+            "reloaded": reloaded,
+            "template_error": self.template_error,
+        }
+
+    def serve(self, address=DEFAULT_ADDRESS):
+        """Atende pedidos em ``address`` até Ctrl+C (um pedido por vez)."""
+        worker = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        reply = worker.handle(json.loads(line))
+                    except ValueError as exc:
+                        reply = {"ok": False, "error": f"pedido inválido: {exc}"}
+                    self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+        socketserver.TCPServer.allow_reuse_address = True
+        with socketserver.TCPServer(tuple(address), Handler) as server:
+            print(f"Worker do template em {address[0]}:{address[1]} "
+                  "(Ctrl+C para sair)")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+
+
+# -------------------------------------------------
+# CLIENTE
+# -------------------------------------------------
+def request_build(params=None, address=DEFAULT_ADDRESS, timeout=60):
+    """Pede uma regeração ao worker e devolve a resposta (dicionário)."""
+    with socket.create_connection(tuple(address), timeout=timeout) as conn:
+        conn.sendall(json.dumps(params or {}).encode() + b"\n")
+        reply = conn.makefile("rb").readline()
+    return json.loads(reply)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Pede ao worker (python main.py serve) que regere o PDF.")
+    parser.add_argument("filename", nargs="?",
+                        help="arquivo de saída (na pasta de saída do worker)")
+    parser.add_argument("--profile", help="perfil de saída (fast, email, print)")
+    parser.add_argument("--linearize", action="store_true")
+    parser.add_argument("--manifest", action="store_true")
+    parser.add_argument("--port", type=int, default=DEFAULT_ADDRESS[1])
+    args = parser.parse_args(argv)
+
+    params = {key: value for key, value in (
+        ("filename", args.filename),
+        ("profile", args.profile),
+        ("linearize", args.linearize),
+        ("manifest", args.manifest),
+    ) if value}
+    try:
+        reply = request_build(params, (DEFAULT_ADDRESS[0], args.port))
+    except OSError as exc:
+        print(f"Worker indisponível ({exc}). Inicie com: python main.py serve")
+        return 1
+
+    if not reply["ok"]:
+        print(f"Erro: {reply['error']}")
+        return 1
+    if reply["reloaded"]:
+        print(f"Recarregado: {', '.join(reply['reloaded'])}")
+    if reply.get("template_error"):
+        print(f"[AVISO] Template com erro (usado o anterior): "
+              f"{reply['template_error']}")
+    print(f"PDF regerado em {reply['ms']} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
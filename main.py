@@ -10,23 +10,39 @@ Form Generator using PyPDF2 + ReportLab
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
+from reportlab import rl_config
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from pypdf import PdfReader, PdfWriter
 from pypdf.generic import (
+    BooleanObject,
     DictionaryObject,
     ArrayObject,
     NameObject,
     NumberObject,
     create_string_object,
 )
+from contextlib import contextmanager, redirect_stdout
 import io
 import os
+import queue
+import sys
+import threading
+import time
 
 # Configurações e helpers do seu projeto:
 from includes.settings import *
 from includes.helpers import *
 from includes.settings import (PDF_FILENAME)
+from includes.fonts import register_fonts
+from includes.manifest import write_manifest, manifest_filename, template_hash
+from includes.retarget import retarget_layout
+from includes.linearize import write_linearized
+from includes.submissions import iter_form_values
+from includes.aggregation import aggregate_reports
+from includes.archive import ArchiveWriter, archive_member_name
+from includes.worker import DEFAULT_ADDRESS, TemplateWorker
+from includes.spatial import FieldIndex
 # -------------------------------------------------
 # CLASSE AUXILIAR PARA GUARDAR INFORMAÇÕES DE CAMPO
 # -------------------------------------------------
@@ -35,7 +51,7 @@ class PDFFormField:
     def __init__(self, name, field_type, x, y, width, height,
                  options=None, required=False):
         self.name = name
-        self.field_type = field_type       # 'text', 'dropdown', 'radio'
+        self.field_type = field_type       # 'text', 'dropdown', 'radio', 'numeric'
         self.x = x
         self.y = y
         self.width = width
@@ -45,12 +61,138 @@ class PDFFormField:
         self.page_num = 0                  # será preenchido ao ser adicionado
 
 
+# -------------------------------------------------
+# CANVAS QUE SÓ EMITE MUDANÇAS DE ESTADO GRÁFICO
+# -------------------------------------------------
+def _color_key(color):
+    """Chave comparável de uma cor do ReportLab (None = não comparável)."""
+    if isinstance(color, colors.CMYKColor):
+        return ("cmyk", color.cyan, color.magenta, color.yellow, color.black,
+                color.density, color.spotName)
+    if isinstance(color, colors.Color):
+        return ("rgb", color.red, color.green, color.blue)
+    if isinstance(color, (tuple, list)) and len(color) == 3:
+        return ("rgb",) + tuple(float(c) for c in color)
+    return None
+
+
+_A85_LOCK = threading.Lock()
+
+
+class StateTrackingCanvas(canvas.Canvas):
+    """Canvas que ignora setFont/setFillColor/setStrokeColor redundantes.
+
+    O ReportLab já acompanha o estado gráfico corrente (``_fontname``,
+    ``_fillColorObj``, ... – restaurado em restoreState e reiniciado a cada
+    página), então basta comparar antes de emitir o operador.  Com
+    ``coalesce_text=True`` textos consecutivos – inclusive com trocas de
+    fonte/cor entre eles – são unidos num único bloco BT … ET.
+    ``use_a85`` (None = padrão do ReportLab) liga/desliga a codificação
+    ASCII85 das imagens e do conteúdo deste documento.
+    """
+    def __init__(self, *args, coalesce_text=False, use_a85=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._coalesce_text = coalesce_text
+        self._last_text_at = None
+        self._use_a85 = use_a85
+
+    @contextmanager
+    def _a85(self):
+        """Aplica ``use_a85`` (opção global do ReportLab) só durante a chamada.
+
+        ``rl_config.useA85`` vale para o processo todo e o ReportLab o lê
+        mais de uma vez por imagem; o lock impede que outra thread o troque
+        no meio de um drawImage/save (mesmo dos canvas sem ``use_a85``).
+        """
+        with _A85_LOCK:
+            if self._use_a85 is None:
+                yield
+                return
+            previous = rl_config.useA85
+            rl_config.useA85 = int(self._use_a85)
+            try:
+                yield
+            finally:
+                rl_config.useA85 = previous
+
+    def drawImage(self, *args, **kwargs):
+        with self._a85():
+            return super().drawImage(*args, **kwargs)
+
+    def save(self):
+        with self._a85():
+            super().save()
+
+    def setFont(self, psfontname, size, leading=None):
+        if leading is None:
+            leading = size * 1.2
+        if (psfontname, size, leading) == (self._fontname, self._fontsize,
+                                           self._leading):
+            return
+        self._absorb_into_text(super().setFont, psfontname, size, leading)
+
+    def _same_color(self, color, current, alpha, alpha_key):
+        key = _color_key(color)
+        if key is None or key != _color_key(current):
+            return False
+        if alpha is None:
+            alpha = getattr(color, "alpha", None)
+        return alpha is None or alpha == self._extgstate.getValue(alpha_key)
+
+    def setFillColor(self, aColor, alpha=None):
+        if self._same_color(aColor, self._fillColorObj, alpha, "ca"):
+            return
+        self._absorb_into_text(super().setFillColor, aColor, alpha)
+
+    def setStrokeColor(self, aColor, alpha=None):
+        if self._same_color(aColor, self._strokeColorObj, alpha, "CA"):
+            return
+        self._absorb_into_text(super().setStrokeColor, aColor, alpha)
+
+    # -------------------------------------------------
+    # pós‑passo opcional: junção de blocos de texto
+    # -------------------------------------------------
+    def _absorb_into_text(self, emit, *args):
+        """Emite o operador; se vier logo após um bloco de texto, entra nele.
+
+        Cor, fonte e ExtGState são permitidos dentro de BT … ET, então
+        "… Tj ET" + "0 g" + "BT /F1 10 Tf 12 TL ET" vira "… Tj 0 g /F1 10 Tf 12 TL ET".
+        """
+        code = self._code
+        n = len(code)
+        emit(*args)
+        if not self._coalesce_text or self._last_text_at != n - 1:
+            return
+        ops = [op[3:-3] if op.startswith("BT ") and op.endswith(" ET") else op
+               for op in code[n:]]
+        del code[n:]
+        if ops:
+            code[-1] = f"{code[-1][:-3]} {' '.join(ops)} ET"
+
+    def drawText(self, aTextObject):
+        if not self._coalesce_text:
+            return super().drawText(aTextObject)
+
+        code = self._code
+        new = str(aTextObject.getCode())
+        if self._last_text_at == len(code) - 1 and new.startswith("BT "):
+            # "… Tj ET" + "BT … ET" → "… Tj … ET" (cada bloco usa Tm absoluto)
+            code[-1] = code[-1][:-3] + new[2:]
+            return
+        code.append(new)
+        self._last_text_at = len(code) - 1
+
+    def showPage(self):
+        self._last_text_at = None
+        super().showPage()
+
+
 # -------------------------------------------------
 # BUILDER – CRIA O PDF ESTÁTICO COM REPORTLAB
 # -------------------------------------------------
 class PDFFormBuilder:
     """Desenha o layout (ReportLab) e registra todos os widgets."""
-    def __init__(self):
+    def __init__(self, profile=None):
         # -------------------------------------------------
         # 1️⃣  Copia as constantes globais para a instância
         # -------------------------------------------------
@@ -76,14 +218,75 @@ class PDFFormBuilder:
         self.LOGO_MAX_HEIGHT = LOGO_MAX_HEIGHT
         self.LOGO_SPACING = LOGO_SPACING
 
+        # fontes (base‑14 ou TTF configurado em settings)
+        fonts = register_fonts()
+        self.FONT = fonts["regular"]
+        self.FONT_BOLD = fonts["bold"]
+        self.FONT_ITALIC = fonts["italic"]
+        self.COALESCE_TEXT_RUNS = COALESCE_TEXT_RUNS
+        self.CHECK_LAYOUT = CHECK_LAYOUT
+
+        # perfil de saída (compressão / resolução dos logos)
+        self.OUTPUT_PROFILE = profile or OUTPUT_PROFILE
+        self.PROFILE = OUTPUT_PROFILES[self.OUTPUT_PROFILE] if self.OUTPUT_PROFILE else {}
+
         # -------------------------------------------------
         # 2️⃣  Cria o canvas e inicializa a lista de campos
         # -------------------------------------------------
-        self.fields = []
         self.buffer = io.BytesIO()
-        self.canvas = canvas.Canvas(self.buffer, pagesize=A4)
+        self.reset()
+
+    def reset(self):
+        """Prepara o builder para um novo documento.
+
+        Reaproveita o buffer (esvaziado) e as constantes já copiadas; só o
+        canvas e a lista de campos são recriados.  O buffer devolvido pelo
+        ``build`` anterior deixa de ser válido.
+        """
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.fields = []
+        self.canvas = StateTrackingCanvas(
+            self.buffer, pagesize=A4,
+            pageCompression=self.PROFILE.get("page_compression"),
+            coalesce_text=self.COALESCE_TEXT_RUNS,
+            use_a85=self.PROFILE.get("use_a85"))
         self.y_pos = self.MARGIN_TOP
         self.current_page = 0
+        self.field_index = FieldIndex(
+            (PAGE_WIDTH, PAGE_HEIGHT),
+            (self.MARGIN_LEFT, self.MARGIN_BOTTOM,
+             self.MARGIN_RIGHT, self.MARGIN_TOP)) if self.CHECK_LAYOUT else None
+
+    def _register_field(self, field):
+        """Associa o campo à página atual e o registra (e no índice espacial)."""
+        field.page_num = self.current_page
+        self.fields.append(field)
+        if self.field_index is not None:
+            self.field_index.add(field)
+
+    def report_layout(self):
+        """Imprime sobreposições/campos fora da página ou das margens."""
+        if self.field_index is None:
+            return []
+        return self.field_index.report()
+
+    # -----------------------------------------------------------------
+    # LOGOTIPOS
+    # -----------------------------------------------------------------
+    def draw_logo(self, path, x, y):
+        """Desenha um logotipo na caixa LOGO_MAX_WIDTH×LOGO_MAX_HEIGHT.
+
+        A imagem é reduzida/recomprimida conforme o perfil de saída.
+        """
+        image = logo_image(path, self.LOGO_MAX_WIDTH, self.LOGO_MAX_HEIGHT,
+                           self.PROFILE.get("logo_dpi"),
+                           self.PROFILE.get("logo_quality"))
+        self.canvas.drawImage(image, x, y,
+                              width=self.LOGO_MAX_WIDTH,
+                              height=self.LOGO_MAX_HEIGHT,
+                              preserveAspectRatio=True,
+                              mask='auto')
 
     # -----------------------------------------------------------------
     # HELPERS DE TEXTO
@@ -93,17 +296,36 @@ class PDFFormBuilder:
                   margin_bottom=TITLE_MARGIN_BOTTOM):
         """Desenha um título com margens configuráveis."""
         self.y_pos -= margin_top
-        self.canvas.setFont("Helvetica-Bold", font_size)
+        self.canvas.setFont(self.FONT_BOLD, font_size)
         self.canvas.drawString(self.MARGIN_LEFT, self.y_pos, text)
         self.y_pos -= (margin_bottom + self.SECTION_SPACING - margin_top)
 
     def add_help_text(self, text):
-        self.canvas.setFont("Helvetica-Oblique", 8)
         self.canvas.setFillColor(colors.grey)
-        self.canvas.drawString(self.MARGIN_LEFT + 5, self.y_pos, text)
+        self.draw_wrapped(text, self.MARGIN_LEFT + 5, self.FONT_ITALIC, 8,
+                          leading=10)
         self.canvas.setFillColor(colors.black)
         self.y_pos -= 15
 
+    def draw_label(self, label, required=False):
+        """Rótulo do campo (quebra automaticamente entre as margens)."""
+        self.draw_wrapped(f"{label}{' *' if required else ''}",
+                          self.MARGIN_LEFT, self.FONT, 10, leading=12)
+
+    def draw_wrapped(self, text, x, font, font_size, leading):
+        """Desenha ``text`` quebrado até MARGIN_RIGHT a partir de ``x``.
+
+        A primeira linha fica em ``y_pos``; cada linha extra desce o cursor
+        ``leading`` pontos (uma linha só mantém o cursor onde estava).
+        """
+        self.canvas.setFont(font, font_size)
+        lines = wrap_text(text, font, font_size, self.MARGIN_RIGHT - x)
+        for i, line in enumerate(lines):
+            if i:
+                self.y_pos -= leading
+            self.canvas.drawString(x, self.y_pos, line)
+        return len(lines)
+
     # -----------------------------------------------------------------
     # CAMPOS BÁSICOS (texto, parágrafo, dropdown, rádio, data)
     # -----------------------------------------------------------------
@@ -115,9 +337,7 @@ class PDFFormBuilder:
                        label_spacing=LABEL_SPACING):
         """Campo de texto simples (1 linha) com padding e espaçamento."""
         self.y_pos -= margin_top
-        self.canvas.setFont("Helvetica", 10)
-        self.canvas.drawString(self.MARGIN_LEFT, self.y_pos,
-                               f"{label}{' *' if required else ''}")
+        self.draw_label(label, required)
         self.y_pos -= 20                     # linha do label
 
         if help_text:
@@ -140,8 +360,7 @@ class PDFFormBuilder:
                              widget_x, widget_y,
                              widget_w, widget_h,
                              required=required)
-        field.page_num = self.current_page
-        self.fields.append(field)
+        self._register_field(field)
 
         self.y_pos -= self.LINE_SPACING
 
@@ -153,9 +372,7 @@ class PDFFormBuilder:
                             label_spacing=LABEL_SPACING):
         """Campo de texto multilinha (área) com padding e espaçamento."""
         self.y_pos -= margin_top
-        self.canvas.setFont("Helvetica", 10)
-        self.canvas.drawString(self.MARGIN_LEFT, self.y_pos,
-                               f"{label}{' *' if required else ''}")
+        self.draw_label(label, required)
         self.y_pos -= 20
 
         if help_text:
@@ -178,8 +395,7 @@ class PDFFormBuilder:
                              widget_x, widget_y,
                              widget_w, widget_h,
                              required=required)
-        field.page_num = self.current_page
-        self.fields.append(field)
+        self._register_field(field)
 
         self.y_pos -= 85
 
@@ -192,9 +408,7 @@ class PDFFormBuilder:
                            label_spacing=LABEL_SPACING):
         """Dropdown (combo) com padding e espaçamento."""
         self.y_pos -= margin_top
-        self.canvas.setFont("Helvetica", 10)
-        self.canvas.drawString(self.MARGIN_LEFT, self.y_pos,
-                               f"{label}{' *' if required else ''}")
+        self.draw_label(label, required)
         self.y_pos -= 20
 
         if help_text:
@@ -224,17 +438,72 @@ class PDFFormBuilder:
                              widget_w, widget_h,
                              options=options,
                              required=required)
-        field.page_num = self.current_page
-        self.fields.append(field)
+        self._register_field(field)
 
         self.y_pos -= self.LINE_SPACING
 
+    def add_numeric_field(self, name, label, min_value=None, max_value=None,
+                          decimals=0, quick_picks=None,
+                          required=False, help_text="",
+                          width=None, pad_x=DEFAULT_PAD_X,
+                          pad_y=DEFAULT_PAD_Y,
+                          margin_top=LABEL_MARGIN_TOP,
+                          margin_bottom=LABEL_MARGIN_BOTTOM,
+                          label_spacing=LABEL_SPACING):
+        """Campo numérico (formatação + validação de faixa no leitor de PDF).
+
+        Substitui os dropdowns gigantes de ``numeric_range``: em vez de 100+
+        opções em /Opt, grava só as ações de formato/teclado/faixa.
+        ``quick_picks`` (opcional) vira um combo editável com poucos valores.
+        """
+        self.y_pos -= margin_top
+        self.draw_label(label, required)
+        self.y_pos -= 20
+
+        if help_text:
+            self.add_help_text(help_text)
+
+        self.y_pos -= label_spacing
+        self.y_pos -= margin_bottom
+
+        field_width = width or (self.MARGIN_RIGHT - self.MARGIN_LEFT)
+
+        self.canvas.setStrokeColor(colors.black)
+        self.canvas.rect(self.MARGIN_LEFT, self.y_pos,
+                         field_width, self.FIELD_HEIGHT)
+
+        if quick_picks:
+            self.canvas.setFillColor(colors.grey)
+            self.canvas.drawString(self.MARGIN_LEFT + field_width - 15,
+                                   self.y_pos + 5, "▼")
+            self.canvas.setFillColor(colors.black)
+
+        field = self._numeric_field(name,
+                                    self.MARGIN_LEFT + pad_x,
+                                    self.y_pos + pad_y,
+                                    field_width - 2 * pad_x,
+                                    self.FIELD_HEIGHT - 2 * pad_y,
+                                    min_value, max_value, decimals,
+                                    quick_picks, required)
+        self._register_field(field)
+
+        self.y_pos -= self.LINE_SPACING
+
+    @staticmethod
+    def _numeric_field(name, x, y, width, height, min_value, max_value,
+                       decimals, quick_picks, required):
+        field = PDFFormField(name, 'numeric', x, y, width, height,
+                             options=list(quick_picks or []),
+                             required=required)
+        field.min_value = min_value
+        field.max_value = max_value
+        field.decimals = decimals
+        return field
+
     def add_radio_group(self, name, label, options,
                         required=False, help_text=""):
         """Grupo de botões de rádio (não utiliza padding próprio)."""
-        self.canvas.setFont("Helvetica", 10)
-        self.canvas.drawString(self.MARGIN_LEFT, self.y_pos,
-                               f"{label}{' *' if required else ''}")
+        self.draw_label(label, required)
         self.y_pos -= 20
 
         if help_text:
@@ -250,7 +519,7 @@ class PDFFormBuilder:
                                radio_size / 2,
                                stroke=1, fill=0)
 
-            self.canvas.setFont("Helvetica", 9)
+            self.canvas.setFont(self.FONT, 9)
             self.canvas.drawString(self.MARGIN_LEFT + offset, self.y_pos, opt)
 
             field = PDFFormField(name, 'radio',
@@ -259,8 +528,7 @@ class PDFFormBuilder:
                                  options=[opt],
                                  required=required)
             field.radio_value = opt
-            field.page_num = self.current_page
-            self.fields.append(field)
+            self._register_field(field)
 
             self.y_pos -= 18
 
@@ -273,9 +541,7 @@ class PDFFormBuilder:
                        label_spacing=LABEL_SPACING):
         """Três dropdowns (dia/mês/ano) com padding + espaçamento."""
         self.y_pos -= margin_top
-        self.canvas.setFont("Helvetica", 10)
-        self.canvas.drawString(self.MARGIN_LEFT, self.y_pos,
-                               f"{label}{' *' if required else ''}")
+        self.draw_label(label, required)
         self.y_pos -= 20
 
         if help_text:
@@ -291,7 +557,7 @@ class PDFFormBuilder:
         cur_x = MARGIN_LEFT
 
         # --------- DIA ----------
-        self.canvas.setFont("Helvetica", 9)
+        self.canvas.setFont(self.FONT, 9)
         self.canvas.drawString(cur_x, self.y_pos + 5, "Dia:")
 
         self.canvas.setStrokeColor(colors.black)
@@ -308,8 +574,7 @@ class PDFFormBuilder:
                              self.FIELD_HEIGHT - 2 * self.DEFAULT_PAD_Y,
                              options=generate_day_options(),
                              required=required)
-        field.page_num = self.current_page
-        self.fields.append(field)
+        self._register_field(field)
 
         cur_x += day_width + 25 + spacing
 
@@ -329,8 +594,7 @@ class PDFFormBuilder:
                              self.FIELD_HEIGHT - 2 * self.DEFAULT_PAD_Y,
                              options=generate_month_options(),
                              required=required)
-        field.page_num = self.current_page
-        self.fields.append(field)
+        self._register_field(field)
 
         cur_x += month_width + 30 + spacing
 
@@ -350,8 +614,7 @@ class PDFFormBuilder:
                              self.FIELD_HEIGHT - 2 * self.DEFAULT_PAD_Y,
                              options=generate_year_options(5),
                              required=required)
-        field.page_num = self.current_page
-        self.fields.append(field)
+        self._register_field(field)
 
         self.y_pos -= self.LINE_SPACING
 
@@ -362,7 +625,7 @@ class PDFFormBuilder:
                                name_text: str,
                                name_dropdown: str,
                                label: str,
-                               dropdown_options,
+                               dropdown_options=None,
                                required=False,
                                help_text="",
                                width_text=None,
@@ -373,12 +636,16 @@ class PDFFormBuilder:
                                pad_y_dd=DEFAULT_PAD_Y,
                                margin_top=LABEL_MARGIN_TOP,
                                margin_bottom=LABEL_MARGIN_BOTTOM,
-                               label_spacing=LABEL_SPACING):
-        """Campo texto + dropdown com padding e espaçamento."""
+                               label_spacing=LABEL_SPACING,
+                               value_range=None):
+        """Campo texto + dropdown com padding e espaçamento.
+
+        Com ``value_range=(mín, máx)`` o dropdown vira um campo numérico
+        (ver ``add_numeric_field``) e ``dropdown_options`` passa a ser a
+        lista opcional de valores rápidos.
+        """
         self.y_pos -= margin_top
-        self.canvas.setFont("Helvetica", 10)
-        self.canvas.drawString(self.MARGIN_LEFT, self.y_pos,
-                               f"{label}{' *' if required else ''}")
+        self.draw_label(label, required)
         self.y_pos -= 20
 
         if help_text:
@@ -405,8 +672,7 @@ class PDFFormBuilder:
         txt_field = PDFFormField(name_text, 'text',
                                  txt_x, txt_y, txt_w, txt_h,
                                  required=required)
-        txt_field.page_num = self.current_page
-        self.fields.append(txt_field)
+        self._register_field(txt_field)
 
         # ---------- Dropdown ----------
         ddl_x = self.MARGIN_LEFT + width_text + 10 + pad_x_dd
@@ -414,17 +680,23 @@ class PDFFormBuilder:
         ddl_w = width_dropdown - 2 * pad_x_dd
         ddl_h = self.FIELD_HEIGHT - 2 * pad_y_dd
 
-        self.canvas.setFillColor(colors.grey)
-        self.canvas.drawString(ddl_x + ddl_w - 15,
-                               ddl_y + 5, "▼")
-        self.canvas.setFillColor(colors.black)
-
-        ddl_field = PDFFormField(name_dropdown, 'dropdown',
-                                 ddl_x, ddl_y, ddl_w, ddl_h,
-                                 options=dropdown_options,
-                                 required=required)
-        ddl_field.page_num = self.current_page
-        self.fields.append(ddl_field)
+        if value_range is None or dropdown_options:
+            self.canvas.setFillColor(colors.grey)
+            self.canvas.drawString(ddl_x + ddl_w - 15,
+                                   ddl_y + 5, "▼")
+            self.canvas.setFillColor(colors.black)
+
+        if value_range is None:
+            ddl_field = PDFFormField(name_dropdown, 'dropdown',
+                                     ddl_x, ddl_y, ddl_w, ddl_h,
+                                     options=dropdown_options,
+                                     required=required)
+        else:
+            ddl_field = self._numeric_field(name_dropdown,
+                                            ddl_x, ddl_y, ddl_w, ddl_h,
+                                            value_range[0], value_range[1],
+                                            0, dropdown_options, required)
+        self._register_field(ddl_field)
 
         self.y_pos -= self.LINE_SPACING
 
@@ -440,6 +712,47 @@ class PDFFormBuilder:
         if self.y_pos < needed_space:
             self.new_page()
 
+# -------------------------------------------------
+# POOL DE BUILDERS (serviços de longa duração)
+# -------------------------------------------------
+class PDFFormBuilderPool:
+    """Recicla instâncias de PDFFormBuilder entre documentos.
+
+    Uso::
+
+        pool = PDFFormBuilderPool()
+        with pool.builder() as b:
+            pdf_buf, fields = b.build()
+            add_form_fields_to_pdf(pdf_buf, fields, "saida.pdf")
+
+    O buffer/campos só podem ser usados dentro do ``with``: ao sair, o
+    builder volta ao pool e é ``reset()`` na próxima retirada.  ``profile``
+    (perfil de saída) vale para o pool todo e pode ser trocado por pedido –
+    ``pool.builder("email")`` –; cada perfil tem sua própria fila de builders.
+    """
+    def __init__(self, size=4, profile=None):
+        self.size = size
+        self.profile = profile
+        self._idle = {}                    # perfil → LifoQueue de builders
+
+    @contextmanager
+    def builder(self, profile=None):
+        profile = profile or self.profile
+        idle = self._idle.setdefault(profile, queue.LifoQueue(maxsize=self.size))
+        try:
+            b = idle.get_nowait()
+            b.reset()
+        except queue.Empty:
+            b = PDFFormBuilder(profile)
+        try:
+            yield b
+        finally:
+            try:
+                idle.put_nowait(b)
+            except queue.Full:
+                pass                       # pool cheio: descarta o excedente
+
+
 # -------------------------------------------------
 #  PATCH TEMPLATE (build) ONTO PDFFormBuilder
 # -------------------------------------------------
@@ -449,8 +762,15 @@ PDFFormBuilder.build = _build_template
 # -------------------------------------------------
 # ADIÇÃO DE ANOTAÇÕES (PyPDF2)
 # -------------------------------------------------
-def add_form_fields_to_pdf(pdf_buffer, fields, output_filename):
-    """Incorpora as anotações interativas ao PDF já desenhado."""
+def add_form_fields_to_pdf(pdf_buffer, fields, output_filename,
+                           compress_level=None, linearize=False, values=None):
+    """Incorpora as anotações interativas ao PDF já desenhado.
+
+    ``compress_level`` (0‑9) recomprime o conteúdo das páginas com zlib.
+    ``linearize=True`` grava o PDF linearizado (fast web view; requer pikepdf).
+    ``values`` ({nome: valor}) pré‑preenche os campos.  ``output_filename``
+    também pode ser um arquivo aberto (ex.: ``io.BytesIO``).
+    """
     reader = PdfReader(pdf_buffer)
     writer = PdfWriter()
 
@@ -464,6 +784,7 @@ def add_form_fields_to_pdf(pdf_buffer, fields, output_filename):
         fields_by_page.setdefault(f.page_num, []).append(f)
 
     # cria anotações
+    acro_fields = ArrayObject()
     for page_num, page_fields in fields_by_page.items():
         page = writer.pages[page_num]
 
@@ -475,16 +796,57 @@ def add_form_fields_to_pdf(pdf_buffer, fields, output_filename):
                 annot = create_text_field(f, page)
             elif f.field_type == "dropdown":
                 annot = create_dropdown_field(f, page)
+            elif f.field_type == "numeric":
+                annot = create_numeric_field(f, page)
             elif f.field_type == "radio":
                 annot = create_radio_field(f, page)
             else:
                 continue
-            page["/Annots"].append(writer._add_object(annot))
-
-    with open(output_filename, "wb") as out_f:
-        writer.write(out_f)
+            if values and f.name in values:
+                _prefill(annot, f, values[f.name])
+            annot_ref = writer._add_object(annot)
+            page["/Annots"].append(annot_ref)
+            acro_fields.append(annot_ref)
+
+    # /AcroForm: sem ele o Acrobat (e a linearização) não enxergam os campos
+    writer._root_object[NameObject("/AcroForm")] = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Fields"): acro_fields,
+                NameObject("/NeedAppearances"): BooleanObject(True),
+            }
+        )
+    )
 
-    print(f"PDF gerado com sucesso → {output_filename}")
+    if compress_level is not None:
+        for page in writer.pages:
+            page.compress_content_streams(level=compress_level)
+
+    to_stream = hasattr(output_filename, "write")
+    if linearize:
+        out = io.BytesIO()
+        writer.write(out)
+        write_linearized(out.getvalue(), output_filename)
+    elif to_stream:
+        writer.write(output_filename)
+    else:
+        with open(output_filename, "wb") as out_f:
+            writer.write(out_f)
+
+    if not to_stream:
+        print(f"PDF gerado com sucesso → {output_filename}")
+
+
+def _prefill(annot, field, value):
+    """Grava ``value`` como valor inicial do widget (rádio: liga a opção)."""
+    value = str(value)
+    if field.field_type == "radio":
+        state = NameObject("/On" if getattr(field, "radio_value", None) == value
+                           else "/Off")
+        annot[NameObject("/AS")] = state
+        annot[NameObject("/V")] = state
+    else:
+        annot[NameObject("/V")] = create_string_object(value)
 
 
 def create_text_field(field, page):
@@ -503,7 +865,7 @@ def create_text_field(field, page):
                     NumberObject(field.y + field.height),
                 ]
             ),
-            NameObject("/P"): page,
+            NameObject("/P"): page.indirect_reference or page,
             NameObject("/F"): NumberObject(4),          # imprimir
         }
     )
@@ -533,7 +895,7 @@ def create_dropdown_field(field, page):
                 ]
             ),
             NameObject("/Opt"): opts,
-            NameObject("/P"): page,
+            NameObject("/P"): page.indirect_reference or page,
             NameObject("/F"): NumberObject(4),
             NameObject("/Ff"): NumberObject(131072),   # combo‑box
         }
@@ -541,6 +903,43 @@ def create_dropdown_field(field, page):
     return annot
 
 
+def create_numeric_field(field, page):
+    """Campo numérico: /Tx (ou combo editável com valores rápidos) + /AA."""
+    decimals = getattr(field, "decimals", 0)
+    fmt_args = f"{decimals}, 3, 0, 0, \"\", true"       # 3 → "1234,56"
+    actions = DictionaryObject(
+        {
+            NameObject("/K"): _javascript(f"AFNumber_Keystroke({fmt_args});"),
+            NameObject("/F"): _javascript(f"AFNumber_Format({fmt_args});"),
+        }
+    )
+    min_value = getattr(field, "min_value", None)
+    max_value = getattr(field, "max_value", None)
+    if min_value is not None or max_value is not None:
+        actions[NameObject("/V")] = _javascript(
+            "AFRange_Validate("
+            f"{'true' if min_value is not None else 'false'}, {min_value or 0}, "
+            f"{'true' if max_value is not None else 'false'}, {max_value or 0});"
+        )
+
+    if field.options:
+        annot = create_dropdown_field(field, page)
+        annot[NameObject("/Ff")] = NumberObject(131072 | 262144)  # combo + edit
+    else:
+        annot = create_text_field(field, page)
+    annot[NameObject("/AA")] = actions
+    return annot
+
+
+def _javascript(code):
+    return DictionaryObject(
+        {
+            NameObject("/S"): NameObject("/JavaScript"),
+            NameObject("/JS"): create_string_object(code),
+        }
+    )
+
+
 def create_radio_field(field, page):
     annot = DictionaryObject()
     annot.update(
@@ -557,7 +956,7 @@ def create_radio_field(field, page):
                     NumberObject(field.y + field.height),
                 ]
             ),
-            NameObject("/P"): page,
+            NameObject("/P"): page.indirect_reference or page,
             NameObject("/F"): NumberObject(4),
             NameObject("/Ff"): NumberObject(49152),    # radio
             NameObject("/AS"): NameObject("/Off"),
@@ -572,13 +971,167 @@ def create_radio_field(field, page):
 # -------------------------------------------------
 # FUNÇÃO PRINCIPAL – GERA O PDF FINAL
 # -------------------------------------------------
-def create_pdf_form(filename=PDF_FILENAME):
+# -------------------------------------------------
+# LAYOUT COMPILADO (cache) E VARIANTES DE TAMANHO DE PÁGINA
+# -------------------------------------------------
+_LAYOUT_CACHE = {}
+
+
+def compiled_layout(pagesize=None, profile=None):
+    """(bytes do PDF estático, campos) do template, com cache em memória.
+
+    O ``build`` roda uma vez por template/dia (as opções de mês/ano mudam
+    com a data); cada ``pagesize`` diferente de A4 é derivado desse plano
+    por ``retarget_layout`` e guardado separadamente.
+    """
+    base_key = (template_hash(), datetime.now().date(), profile)
+    if base_key not in _LAYOUT_CACHE:
+        # descarta planos de outro template/dia
+        for key in [k for k in _LAYOUT_CACHE if k[:2] != base_key[:2]]:
+            del _LAYOUT_CACHE[key]
+        builder = PDFFormBuilder(profile)
+        pdf_buf, fields = builder.build()
+        builder.report_layout()
+        _LAYOUT_CACHE[base_key] = (pdf_buf.getvalue(), fields)
+
+    if pagesize is None or tuple(pagesize) == tuple(A4):
+        return _LAYOUT_CACHE[base_key]
+
+    key = base_key + (tuple(pagesize),)
+    if key not in _LAYOUT_CACHE:
+        _LAYOUT_CACHE[key] = retarget_layout(*_LAYOUT_CACHE[base_key], pagesize)
+    return _LAYOUT_CACHE[key]
+
+
+def create_pdf_form(filename=PDF_FILENAME, manifest=False, pagesize=None,
+                    profile=None, linearize=False):
     print("Construindo layout do PDF…")
-    builder = PDFFormBuilder()
-    pdf_buf, fields = builder.build()          # ← agora funciona
+    started = time.perf_counter()
+    if pagesize is None:
+        builder = PDFFormBuilder(profile)
+        pdf_buf, fields = builder.build()          # ← agora funciona
+        builder.report_layout()
+        profile = builder.OUTPUT_PROFILE
+    else:
+        profile = profile or OUTPUT_PROFILE
+        pdf_bytes, fields = compiled_layout(pagesize, profile)
+        pdf_buf = io.BytesIO(pdf_bytes)
 
     print(f"Adicionando {len(fields)} widgets ao PDF…")
-    add_form_fields_to_pdf(pdf_buf, fields, filename)
+    compress_level = OUTPUT_PROFILES[profile].get("compress_level") if profile else None
+    add_form_fields_to_pdf(pdf_buf, fields, filename, compress_level,
+                           linearize=linearize)
+
+    elapsed = time.perf_counter() - started
+    print(f"Perfil {profile or 'padrão'}: {os.path.getsize(filename)} bytes "
+          f"em {elapsed:.2f}s")
+
+    if manifest:
+        manifest_path = write_manifest(fields, manifest_filename(filename))
+        print(f"Manifesto de campos → {manifest_path}")
+
+
+# -------------------------------------------------
+# LOTES – SAÍDA EM ZIP/TAR (OU STDOUT) EM FLUXO
+# -------------------------------------------------
+def create_pdf_archive(rows, archive="relatorios.zip", fmt="zip",
+                       compress=False, name_template="relatorio_{n:04d}.pdf",
+                       pagesize=None, profile=None):
+    """Gera um PDF pré‑preenchido por item de ``rows`` direto no pacote.
+
+    ``rows`` é um iterável de ``{campo: valor}`` (pode ser um gerador – só o
+    documento atual fica em memória).  ``archive`` é o caminho do zip/tar,
+    um arquivo aberto ou ``"-"`` para a saída padrão; ``fmt`` é ``"zip"``
+    ou ``"tar"``.  ``compress=False`` só armazena os PDFs (já comprimidos).
+    ``name_template`` monta o nome de cada PDF com os valores da linha e
+    ``{n}`` (índice a partir de 1).  As mensagens vão para stderr, para não
+    misturar com o pacote quando ``archive="-"``.
+    """
+    label = archive if isinstance(archive, str) else fmt
+    if archive == "-":
+        # o pacote sai em stdout: os avisos do build vão para stderr
+        sys.stdout.flush()
+        archive = sys.stdout.buffer
+        with redirect_stdout(sys.stderr):
+            return create_pdf_archive(rows, archive, fmt, compress,
+                                      name_template, pagesize, profile)
+
+    profile = profile or OUTPUT_PROFILE
+    pdf_bytes, fields = compiled_layout(pagesize, profile)
+    compress_level = OUTPUT_PROFILES[profile].get("compress_level") if profile else None
+
+    started = time.perf_counter()
+    with ArchiveWriter(archive, fmt, compress) as writer:
+        for n, row in enumerate(rows, start=1):
+            out = io.BytesIO()
+            add_form_fields_to_pdf(io.BytesIO(pdf_bytes), fields, out,
+                                   compress_level, values=row)
+            writer.add(archive_member_name(name_template, row, n),
+                       out.getvalue())
+            if n % 100 == 0:
+                print(f"{n} PDF(s) gravado(s)…", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    print(f"{writer.count} PDF(s) → {label} em {elapsed:.2f}s", file=sys.stderr)
+    return writer.count
+
+
+# -------------------------------------------------
+# RESUMO CONSOLIDADO DAS OFICINAS
+# -------------------------------------------------
+def create_summary_pdf(report_filenames, filename="resumo_oficinas.pdf",
+                       manifest=None, workers=None):
+    """Soma as métricas de vários relatórios devolvidos e gera um PDF-resumo.
+
+    ``manifest`` (opcional) é o manifesto carregado; sem ele os campos são
+    obtidos construindo o template atual.  ``workers`` > 1 lê os PDFs em
+    paralelo.
+    """
+    if manifest is None:
+        _, fields = PDFFormBuilder().build()
+
+    print(f"Consolidando {len(report_filenames)} relatório(s)…")
+    records = (values for _, values
+               in iter_form_values(report_filenames, workers))
+    result = aggregate_reports(records, fields if manifest is None else manifest)
+
+    builder = PDFFormBuilder()
+    builder.add_title("RESUMO CONSOLIDADO DAS OFICINAS", 14)
+    for g, group in enumerate(result["groups"]):
+        builder.check_space(150)
+        oficina, periodo = group
+        builder.add_title(f"{oficina or '—'} · {periodo or '—'}", 11)
+        builder.draw_wrapped(f"Relatórios: {result['documents'][g]}",
+                             builder.MARGIN_LEFT, builder.FONT, 9, leading=12)
+        builder.y_pos -= 14
+        for m, metric in enumerate(result["metrics"]):
+            if not result["filled"][g, m]:
+                continue
+            if builder.y_pos < builder.MARGIN_BOTTOM:
+                builder.new_page()
+            builder.draw_wrapped(
+                f"{metric}: total {result['sums'][g, m]:g} "
+                f"(média por relatório {result['means'][g, m]:.1f})",
+                builder.MARGIN_LEFT + 10, builder.FONT, 9, leading=12)
+            builder.y_pos -= 12
+        builder.y_pos -= builder.SECTION_SPACING
+
+    builder.canvas.save()
+    with open(filename, "wb") as out_f:
+        out_f.write(builder.buffer.getvalue())
+    print(f"Resumo gerado → {filename}")
+    return result
+
+
+# -------------------------------------------------
+# MODO WORKER – RECARGA DO TEMPLATE SEM REINICIAR O PROCESSO
+# -------------------------------------------------
+def template_worker():
+    """Worker que regera o formulário e recarrega ``includes/template.py``."""
+    return TemplateWorker(PDFFormBuilder, create_pdf_form, LOGO_PATHS,
+                          output_dir=WORKER_OUTPUT_DIR,
+                          default_filename=PDF_FILENAME,
+                          profiles=OUTPUT_PROFILES)
 
 
 # -------------------------------------------------
@@ -586,10 +1139,14 @@ def create_pdf_form(filename=PDF_FILENAME):
 # -------------------------------------------------
 if __name__ == "__main__":
     try:
-        create_pdf_form()
+        if sys.argv[1:2] == ["serve"]:
+            port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ADDRESS[1]
+            template_worker().serve((DEFAULT_ADDRESS[0], port))
+        else:
+            create_pdf_form()
     except ImportError as exc:
         print("Pacotes ausentes. Instale com:")
-        print("    pip install reportlab pypdf python-dateutil")
+        print("    pip install -r requirements.txt")
         print(f"Detalhes: {exc}")
     except Exception as exc:
         print(f"Erro ao gerar o PDF: {exc}")
@@ -0,0 +1,54 @@
+# soak_pool.py
+"""
+Teste de longa duração do PDFFormBuilderPool.
+
+Gera ``N`` documentos completos (build + widgets + gravação) reciclando os
+builders do pool e imprime o RSS do processo a cada ``--every`` documentos.
+Com o pool correto o RSS estabiliza logo após o aquecimento.
+
+    python soak_pool.py 100000 --every 5000 --profile email
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import resource
+import time
+
+import main
+
+
+def rss_mb():
+    """RSS atual do processo (MB); sem /proc usa o pico (ru_maxrss)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def soak(total, every, profile=None, size=4):
+    pool = main.PDFFormBuilderPool(size)
+    started = time.perf_counter()
+    print(f"{'documentos':>10}  {'RSS (MB)':>8}  {'ms/doc':>6}")
+    for n in range(1, total + 1):
+        with contextlib.redirect_stdout(io.StringIO()):
+            with pool.builder(profile) as b:
+                pdf_buf, fields = b.build()
+                main.add_form_fields_to_pdf(pdf_buf, fields, os.devnull)
+        if n % every == 0 or n == total:
+            elapsed = time.perf_counter() - started
+            print(f"{n:>10}  {rss_mb():>8.1f}  {elapsed / n * 1000:>6.1f}",
+                  flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("total", type=int, nargs="?", default=100_000)
+    parser.add_argument("--every", type=int, default=1000)
+    parser.add_argument("--profile", help="perfil de saída (fast, email, print)")
+    parser.add_argument("--size", type=int, default=4, help="tamanho do pool")
+    args = parser.parse_args()
+    soak(args.total, args.every, args.profile, args.size)